@@ -5,6 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 from app.models.user_model import Base  # adjust "myapp.models" to the actual location of your Base
+import app.models.counter_model  # noqa: F401 registers row_counters on Base.metadata
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,32 @@
+"""add row_counters table with a maintained users count
+
+Revision ID: 8b1e5d0c6a27
+Revises: 3f9a2c7d1e4b
+Create Date: 2026-10-18 10:02:17.553910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e5d0c6a27'
+down_revision: Union[str, None] = '3f9a2c7d1e4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('row_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Seed from the current table; UserService keeps it in step from here on.
+    op.execute("INSERT INTO row_counters (name, value) SELECT 'users', count(*) FROM users")
+
+
+def downgrade() -> None:
+    op.drop_table('row_counters')
@@ -0,0 +1,36 @@
+"""add pg_trgm GIN indexes for user search
+
+Revision ID: a7c2e4d9f630
+Revises: e5a3b8f2c914
+Create Date: 2026-10-18 14:02:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e4d9f630'
+down_revision: Union[str, None] = 'e5a3b8f2c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_FIELDS = ('nickname', 'email', 'first_name', 'last_name')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Built concurrently so the migration does not block writes on a large users table.
+    with op.get_context().autocommit_block():
+        for name in SEARCH_FIELDS:
+            op.create_index(f'ix_users_{name}_trgm', 'users', [sa.text(f'lower({name}) gin_trgm_ops')],
+                            unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    # The pg_trgm extension is left installed; other schemas may rely on it.
+    with op.get_context().autocommit_block():
+        for name in SEARCH_FIELDS:
+            op.drop_index(f'ix_users_{name}_trgm', table_name='users', postgresql_concurrently=True)
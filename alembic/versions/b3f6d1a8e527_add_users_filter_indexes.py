@@ -0,0 +1,41 @@
+"""add indexes backing the user listing filters and sort keys
+
+Revision ID: b3f6d1a8e527
+Revises: a7c2e4d9f630
+Create Date: 2026-10-18 15:11:48.530662
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f6d1a8e527'
+down_revision: Union[str, None] = 'a7c2e4d9f630'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, columns, partial index predicate)
+INDEXES = (
+    ('ix_users_live_role_created_at_id', ['role', 'created_at', 'id'], 'deleted_at IS NULL'),
+    ('ix_users_live_last_login_at_id', ['last_login_at', 'id'], 'deleted_at IS NULL'),
+    ('ix_users_locked_created_at_id', ['created_at', 'id'], 'is_locked AND deleted_at IS NULL'),
+    ('ix_users_unverified_created_at_id', ['created_at', 'id'], 'NOT email_verified AND deleted_at IS NULL'),
+    ('ix_users_professional_created_at_id', ['created_at', 'id'], 'is_professional AND deleted_at IS NULL'),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently so the migration does not block writes on a large users table.
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(name, 'users', columns, unique=False,
+                            postgresql_where=sa.text(where), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""add users.deleted_at for soft delete with partial indexes
+
+Revision ID: c4d7e91a0b35
+Revises: 8b1e5d0c6a27
+Create Date: 2026-10-18 11:20:45.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e91a0b35'
+down_revision: Union[str, None] = '8b1e5d0c6a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    # Built concurrently so the migration does not block writes on a large users table.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_live_created_at_id', 'users', ['created_at', 'id'], unique=False,
+                        postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.create_index('ix_users_deleted_at', 'users', ['deleted_at'], unique=False,
+                        postgresql_where=sa.text('deleted_at IS NOT NULL'), postgresql_concurrently=True)
+        op.drop_index('ix_users_created_at_id', table_name='users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_users_deleted_at', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_live_created_at_id', table_name='users', postgresql_concurrently=True)
+    op.drop_column('users', 'deleted_at')
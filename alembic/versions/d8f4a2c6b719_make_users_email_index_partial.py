@@ -0,0 +1,36 @@
+"""limit the unique lower(email) index to users that are not soft-deleted
+
+Revision ID: d8f4a2c6b719
+Revises: b3f6d1a8e527
+Create Date: 2026-10-19 09:42:17.305114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f4a2c6b719'
+down_revision: Union[str, None] = 'b3f6d1a8e527'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A soft-deleted user no longer holds on to its email, so the address can be
+    # registered again while the old row waits for the purger.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_live_email_lower', 'users', [sa.text('lower(email)')], unique=True,
+            postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True,
+        )
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    # Fails if an email has been re-registered since one of its owners was soft-deleted.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_live_email_lower', table_name='users', postgresql_concurrently=True)
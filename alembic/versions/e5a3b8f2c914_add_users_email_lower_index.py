@@ -0,0 +1,38 @@
+"""replace the users email index with a unique lower(email) index
+
+Revision ID: e5a3b8f2c914
+Revises: c4d7e91a0b35
+Create Date: 2026-10-18 13:05:12.481930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a3b8f2c914'
+down_revision: Union[str, None] = 'c4d7e91a0b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Accounts differing only by case cannot be merged automatically; fail with a clear
+    # message instead of a unique violation halfway through the index build.
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM (SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1) AS d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(f"{duplicates} emails are registered more than once with different case; resolve them before upgrading.")
+    # Built concurrently so the migration does not block writes on a large users table.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_email', table_name='users', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email', 'users', ['email'], unique=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,86 @@
+"""
+Pick password hashing parameters for a target verify latency on this machine.
+
+Times `verify` for increasing costs of the chosen scheme and reports the highest cost
+whose median verify time stays within the target: the bcrypt cost factor, or the
+argon2id time cost at a fixed memory cost and parallelism. Run it on the hardware that
+serves logins and copy the printed settings into the environment; existing hashes are
+upgraded to the new parameters on each user's next login.
+
+Usage:
+    python -m app.cli.calibrate_hashing --scheme bcrypt --target-ms 250
+"""
+
+from builtins import int, len, print, range, str
+import argparse
+import statistics
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+from app.utils.hashers import Argon2idHasher, BcryptHasher, PasswordHasher
+
+PASSWORD = "Calibration$Password1"
+
+
+def time_verify(hasher: PasswordHasher, samples: int) -> float:
+    """Median seconds for one `verify` with `hasher`."""
+    hashed = hasher.hash(PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.verify(PASSWORD, hashed)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(
+    make_hasher: Callable[[int], PasswordHasher], costs: Iterable[int], target: float, samples: int
+) -> Tuple[int, List[Tuple[int, float]]]:
+    """
+    Time `verify` for each cost in increasing order, stopping at the first one over `target`.
+
+    :return: The highest cost within the target (the lowest cost tried if none is) and
+        the (cost, seconds) measurements taken.
+    """
+    measurements: List[Tuple[int, float]] = []
+    for cost in costs:
+        seconds = time_verify(make_hasher(cost), samples)
+        measurements.append((cost, seconds))
+        if seconds > target:
+            break
+    within = [cost for cost, seconds in measurements if seconds <= target]
+    return (within[-1] if within else measurements[0][0]), measurements
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pick password hashing costs for a target verify latency.")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2id"], default="bcrypt", help="Hashing scheme to calibrate")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target median verify time in milliseconds")
+    parser.add_argument("--samples", type=int, default=5, help="Verifies timed per cost")
+    parser.add_argument("--memory-cost", type=int, default=65536, help="argon2id memory in KiB")
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2id lanes")
+    args = parser.parse_args(argv)
+
+    target = args.target_ms / 1000
+    if args.scheme == "bcrypt":
+        cost, measurements = calibrate(BcryptHasher, range(4, 32), target, args.samples)
+        setting = f"PASSWORD_BCRYPT_ROUNDS={cost}"
+    else:
+        cost, measurements = calibrate(
+            lambda time_cost: Argon2idHasher(time_cost, args.memory_cost, args.parallelism),
+            range(1, 64), target, args.samples,
+        )
+        setting = (
+            f"PASSWORD_ARGON2_TIME_COST={cost}\n"
+            f"PASSWORD_ARGON2_MEMORY_COST={args.memory_cost}\n"
+            f"PASSWORD_ARGON2_PARALLELISM={args.parallelism}"
+        )
+
+    for measured_cost, seconds in measurements:
+        print(f"{args.scheme} cost {measured_cost:>2}: {seconds * 1000:8.1f} ms")
+    print(f"\nPASSWORD_HASH_SCHEME={args.scheme}\n{setting}")
+    if len(measurements) == 1 and measurements[0][1] > target:
+        print(f"# Even the lowest cost exceeds {args.target_ms:g} ms on this machine")
+
+
+if __name__ == "__main__":
+    main()
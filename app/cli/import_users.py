@@ -0,0 +1,249 @@
+"""
+Bulk import users from a CSV or NDJSON export of a legacy system.
+
+Rows are streamed from the file in fixed-size chunks, validated with `UserCreate`,
+their passwords hashed with `hash_password` in a process pool, and loaded with
+PostgreSQL COPY into a temporary staging table, then moved into `users` with
+`INSERT ... ON CONFLICT (lower(email)) DO NOTHING`. Memory use is bounded by the chunk size.
+
+After each committed chunk the number of consumed records is written to a checkpoint
+file, so an interrupted import resumes where it stopped. Re-importing a chunk is
+harmless: rows whose email already exists are skipped. A nickname that is already
+taken, by an existing user or within the chunk, is replaced with a generated one, as
+`UserService.create` does, and reported separately.
+
+Usage:
+    python -m app.cli.import_users users.csv --chunk-size 5000 --workers 8
+"""
+
+from builtins import Exception, RuntimeError, dict, int, len, open, range, set, str
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from app.models.user_model import User
+from app.schemas.user_schemas import UserCreate
+from app.services.user_service import UserService
+from app.utils.nickname_gen import generate_nickname, generate_nicknames
+from app.utils.security import generate_verification_token, hash_password
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "users_import_staging"
+# Rounds of regenerating nicknames for staged rows that collide before giving up on a chunk.
+NICKNAME_RESOLVE_ROUNDS = 5
+COPY_COLUMNS = [
+    "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "role", "is_professional",
+    "failed_login_attempts", "is_locked", "verification_token", "email_verified", "hashed_password",
+]
+
+
+def read_records(path: str, file_format: str) -> Iterator[Dict[str, str]]:
+    """Yield one dict per record without loading the file into memory."""
+    with open(path, newline="", encoding="utf-8") as source:
+        if file_format == "csv":
+            for row in csv.DictReader(source):
+                # Empty CSV cells mean "not provided" rather than an empty string.
+                yield {key: value for key, value in row.items() if value != ""}
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def chunked(records: Iterator[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_checkpoint(path: str) -> int:
+    """Return the number of records already imported, or 0 without a checkpoint."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as checkpoint:
+        return json.load(checkpoint)["records_done"]
+
+
+def save_checkpoint(path: str, records_done: int) -> None:
+    # Write then rename so a crash never leaves a truncated checkpoint behind.
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as checkpoint:
+        json.dump({"records_done": records_done}, checkpoint)
+    os.replace(temporary, path)
+
+
+def validate_chunk(chunk: List[Dict[str, str]]) -> Tuple[List[UserCreate], int]:
+    """Validate a chunk of raw records, returning the valid users and the number rejected."""
+    valid, rejected = [], 0
+    for record in chunk:
+        try:
+            valid.append(UserCreate(**record))
+        except ValidationError as e:
+            rejected += 1
+            logger.warning(f"Skipping invalid record for {record.get('email')!r}: {e.error_count()} error(s)")
+    return valid, rejected
+
+
+def build_copy_records(users: List[UserCreate], hashed_passwords: List[str], verified: bool) -> List[tuple]:
+    records = []
+    for user, hashed_password in zip(users, hashed_passwords):
+        records.append((
+            uuid.uuid4(), user.nickname or generate_nickname(), user.email, user.first_name, user.last_name,
+            user.bio, user.profile_picture_url, user.linkedin_profile_url, user.github_profile_url,
+            user.role.name, False, 0, False, None if verified else generate_verification_token(),
+            verified, hashed_password,
+        ))
+    return records
+
+
+async def resolve_nicknames(connection) -> int:
+    """
+    Give every staged row whose nickname is taken, by an existing user or by another
+    row of the same chunk, a freshly generated one, so no row is dropped for its
+    nickname. Returns the number of rows renamed.
+    """
+    renamed = set()
+    for _ in range(NICKNAME_RESOLVE_ROUNDS):
+        conflicts = await connection.fetch(
+            f"SELECT id FROM ("
+            f"SELECT id, nickname, row_number() OVER (PARTITION BY nickname ORDER BY id) AS rank FROM {STAGING_TABLE}"
+            f") AS staged WHERE rank > 1 "
+            f"OR EXISTS (SELECT 1 FROM {User.__tablename__} AS existing WHERE existing.nickname = staged.nickname)"
+        )
+        if not conflicts:
+            return len(renamed)
+        ids = [row["id"] for row in conflicts]
+        await connection.execute(
+            f"UPDATE {STAGING_TABLE} SET nickname = replacement.nickname "
+            f"FROM unnest($1::uuid[], $2::text[]) AS replacement (id, nickname) "
+            f"WHERE {STAGING_TABLE}.id = replacement.id",
+            ids, generate_nicknames(len(ids)),
+        )
+        renamed.update(ids)
+    raise RuntimeError(f"Could not find free nicknames for {len(conflicts)} staged users")
+
+
+async def import_chunk(connection, records: List[tuple]) -> Tuple[int, int]:
+    """
+    COPY one chunk into staging, replace taken nicknames and move it into users.
+
+    Only email conflicts are skipped; a nickname taken concurrently after it was
+    resolved fails the chunk, which is retried when the import is resumed.
+
+    :return: The number of rows inserted and the number of nicknames replaced.
+    """
+    async with connection.transaction():
+        await connection.copy_records_to_table(STAGING_TABLE, records=records, columns=COPY_COLUMNS)
+        renamed = await resolve_nicknames(connection)
+        status = await connection.execute(
+            f"INSERT INTO {User.__tablename__} SELECT * FROM {STAGING_TABLE} ON CONFLICT ((lower(email))) WHERE deleted_at IS NULL DO NOTHING"
+        )
+        inserted = int(status.split()[-1])
+        if UserService.maintains_user_count():
+            await connection.execute(
+                "INSERT INTO row_counters (name, value) VALUES ($1, $2) "
+                "ON CONFLICT (name) DO UPDATE SET value = row_counters.value + EXCLUDED.value",
+                User.__tablename__, inserted,
+            )
+    return inserted, renamed
+
+
+async def run_import(
+    path: str,
+    file_format: str,
+    chunk_size: int,
+    workers: int,
+    checkpoint_path: str,
+    verified: bool = True,
+    database_url: Optional[str] = None,
+) -> Dict[str, int]:
+    records_done = load_checkpoint(checkpoint_path)
+    totals = {"read": 0, "inserted": 0, "skipped": 0, "renamed": 0, "rejected": 0}
+    if records_done:
+        logger.info(f"Resuming after {records_done} records")
+
+    engine = create_async_engine(database_url or settings.database_url, poolclass=NullPool)
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as sa_connection:
+            raw_connection = await sa_connection.get_raw_connection()
+            connection = raw_connection.driver_connection
+            await connection.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+                f"(LIKE {User.__tablename__} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                records = islice(read_records(path, file_format), records_done, None)
+                for chunk in chunked(records, chunk_size):
+                    users, rejected = validate_chunk(chunk)
+                    hashed_passwords = await asyncio.gather(
+                        *(loop.run_in_executor(executor, hash_password, user.password) for user in users)
+                    )
+                    inserted, renamed = (
+                        await import_chunk(connection, build_copy_records(users, hashed_passwords, verified)) if users else (0, 0)
+                    )
+
+                    records_done += len(chunk)
+                    save_checkpoint(checkpoint_path, records_done)
+                    totals["read"] += len(chunk)
+                    totals["inserted"] += inserted
+                    totals["skipped"] += len(users) - inserted
+                    totals["renamed"] += renamed
+                    totals["rejected"] += rejected
+                    elapsed = time.perf_counter() - started
+                    logger.info(
+                        f"{records_done} records done, {totals['inserted']} inserted, "
+                        f"{totals['skipped']} skipped, {totals['renamed']} renamed, {totals['rejected']} rejected, "
+                        f"{totals['read'] / elapsed:.0f} rows/s"
+                    )
+    finally:
+        await engine.dispose()
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import users from a CSV or NDJSON file.")
+    parser.add_argument("path", help="CSV (with a header row) or NDJSON file of users")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="File format; inferred from the extension when omitted")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Records per COPY and per checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes used to hash passwords")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint)")
+    parser.add_argument("--unverified", action="store_true", help="Require imported users to verify their email")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    started = time.perf_counter()
+    totals = asyncio.run(run_import(
+        args.path,
+        file_format,
+        args.chunk_size,
+        args.workers,
+        args.checkpoint or f"{args.path}.checkpoint",
+        verified=not args.unverified,
+    ))
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Import finished: {totals['inserted']} inserted, {totals['skipped']} skipped (email already exists), "
+        f"{totals['renamed']} nicknames replaced, {totals['rejected']} rejected in {elapsed:.1f}s ({totals['read'] / max(elapsed, 1e-9):.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,91 @@
+import time
+from typing import Optional
+from sqlalchemy import Delete, Insert, Update
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.utils.metrics import LatencyHistogram
 
 Base = declarative_base()
 
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = LatencyHistogram()
+        self.checkout_timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the read replica until it writes. Once a flush or DML
+    statement has gone through it, every later statement is pinned to the primary so
+    the rest of the request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["pinned_to_primary"] = True
+        if self.info.get("pinned_to_primary") or Database._read_engine is None:
+            return Database._engine.sync_engine
+        return Database._read_engine.sync_engine
+
 class Database:
     """Handles database connections and sessions."""
     _engine = None
     _session_factory = None
+    _read_engine = None
+    _read_session_factory = None
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
-        """Initialize the async engine and sessionmaker."""
+    def initialize(
+        cls,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        read_database_url: Optional[str] = None,
+    ):
+        """Initialize the async engine and sessionmaker, plus the read replica engine when configured."""
         if cls._engine is None:  # Ensure engine is created once
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            pool_options = dict(
+                poolclass=InstrumentedAsyncPool,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+            )
+            cls._engine = create_async_engine(database_url, echo=echo, future=True, **pool_options)
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
+            if read_database_url:
+                # Replica connections only ever serve reads, so open their transactions READ ONLY.
+                cls._read_engine = create_async_engine(
+                    read_database_url,
+                    echo=echo,
+                    future=True,
+                    execution_options={"postgresql_readonly": True},
+                    **pool_options,
+                )
+                cls._read_session_factory = sessionmaker(
+                    class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False, future=True
+                )
 
     @classmethod
     def get_session_factory(cls):
@@ -23,3 +93,34 @@ class Database:
         if cls._session_factory is None:
             raise ValueError("Database not initialized. Call `initialize()` first.")
         return cls._session_factory
+
+    @classmethod
+    def get_read_session_factory(cls):
+        """Returns the replica-routing session factory, falling back to the primary when no replica is configured."""
+        if cls._read_session_factory is None:
+            return cls.get_session_factory()
+        return cls._read_session_factory
+
+    @classmethod
+    def has_read_replica(cls) -> bool:
+        return cls._read_engine is not None
+
+    @classmethod
+    def get_pool_stats(cls, read_replica: bool = False) -> dict:
+        """
+        Returns a snapshot of the primary (or read replica) connection pool, used to size
+        workers against the server's `max_connections`.
+        """
+        engine = cls._read_engine if read_replica else cls._engine
+        if engine is None:
+            raise ValueError("Database engine not initialized.")
+        pool = engine.pool
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkout_timeouts": pool.checkout_timeouts,
+            "checkout_wait_seconds": pool.checkout_wait.snapshot(),
+        }
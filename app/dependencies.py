@@ -1,11 +1,15 @@
-from builtins import Exception, dict, str
-from fastapi import Depends, HTTPException
+from builtins import Exception, ValueError, dict, int, isinstance, max, str
+import math
+from typing import Optional, Sequence
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import Database
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
-from app.services.jwt_service import decode_token
+from app.services.jwt_service import decode_token_cached
+from app.utils.hash_executor import HashingOverloadedError
+from app.utils.rate_limit import client_ip, get_rate_limit_backend, parse_networks
 from settings.config import Settings
 from fastapi import Depends
 
@@ -17,32 +21,60 @@ def get_email_service() -> EmailService:
     template_manager = TemplateManager()
     return EmailService(template_manager=template_manager)
 
+# Errors raised by endpoints that already map to a response of their own; wrapping
+# them in a 500 would drop their status code and headers (e.g. Retry-After).
+PASSTHROUGH_ERRORS = (HTTPException, HashingOverloadedError)
+
 async def get_db() -> AsyncSession:
     """Dependency that provides a database session for each request."""
     async_session_factory = Database.get_session_factory()
     async with async_session_factory() as session:
         try:
             yield session
+        except PASSTHROUGH_ERRORS:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+async def get_read_db() -> AsyncSession:
+    """
+    Dependency that provides a session for read-mostly endpoints. Reads go to the read
+    replica when one is configured; once the session writes it sticks to the primary.
+    """
+    async_session_factory = Database.get_read_session_factory()
+    async with async_session_factory() as session:
+        try:
+            yield session
+        except PASSTHROUGH_ERRORS:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
-        
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+def get_current_user(request: Request, token: str = Depends(oauth2_scheme)):
+    """
+    Resolve the principal for the request's bearer token. The result is kept on
+    `request.state.principal`, so a request verifies its token at most once, and
+    verified claims are reused across requests through the token claims cache.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    payload = decode_token(token)
+    payload = decode_token_cached(token)
     if payload is None:
         raise credentials_exception
     user_email: str = payload.get("sub")
     user_role: str = payload.get("role")
     if user_email is None or user_role is None:
         raise credentials_exception
-    return {"user_email": user_email, "role": user_role}
+    request.state.principal = {"user_email": user_email, "role": user_role}
+    return request.state.principal
 
 def require_role(role: str):
     def role_checker(current_user: dict = Depends(get_current_user)):
@@ -50,3 +82,47 @@ def require_role(role: str):
             raise HTTPException(status_code=403, detail="Operation not permitted")
         return current_user
     return role_checker
+
+async def _submitted_field(request: Request, field: str) -> Optional[str]:
+    # FastAPI has already parsed the body for the endpoint, and Starlette caches it on the request.
+    if request.headers.get("content-type", "").startswith(("application/x-www-form-urlencoded", "multipart/form-data")):
+        value = (await request.form()).get(field)
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        value = body.get(field) if isinstance(body, dict) else None
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+def rate_limit(
+    scope: str, identity_field: str, per_ip: int, per_identity: int, window: float, trusted_proxies: Sequence[str] = ()
+):
+    """
+    Dependency that answers 429 once the client IP, or the account named by
+    `identity_field` in the submitted body, has used up its attempts for the window.
+    It runs before the endpoint, so rejected attempts cost no database or hashing work.
+    A limit of 0 disables that check. Behind a reverse proxy, list the proxy's
+    addresses in `trusted_proxies` so the client IP is taken from X-Forwarded-For
+    instead of every client sharing the proxy's address.
+    """
+    trusted = parse_networks(trusted_proxies)
+
+    async def limiter(request: Request):
+        checks = []
+        if per_ip:
+            ip = client_ip(request.client.host if request.client else None, request.headers.get("x-forwarded-for"), trusted)
+            checks.append((f"{scope}:ip:{ip}", per_ip))
+        identity = await _submitted_field(request, identity_field) if per_identity else None
+        if identity:
+            checks.append((f"{scope}:identity:{identity}", per_identity))
+        backend = get_rate_limit_backend()
+        for key, limit in checks:
+            retry_after = await backend.hit(key, limit, window)
+            if retry_after is not None:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many attempts, please try again later.",
+                    headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+                )
+    return limiter
@@ -4,8 +4,11 @@ from starlette.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware  # Import the CORSMiddleware
 from app.database import Database
 from app.dependencies import get_settings
-from app.routers import user_routes
+from app.routers import metrics_routes, user_routes
+from app.services.user_purger import UserPurger
 from app.utils.api_description import getDescription
+from app.utils.hash_executor import HashingOverloadedError
+from app.utils.security import configure_hash_executor, shutdown_hash_executor
 app = FastAPI(
     title="User Management",
     description=getDescription(),
@@ -31,12 +34,53 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
+    Database.initialize(
+        settings.database_url,
+        settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        read_database_url=settings.database_read_url,
+    )
+    configure_hash_executor(
+        settings.password_hash_workers,
+        settings.password_hash_executor,
+        max_pending=settings.password_hash_max_pending,
+        deadline=settings.password_hash_queue_deadline,
+        retry_after=settings.password_hash_retry_after,
+    )
+    if settings.user_purge_enabled:
+        app.state.user_purger = UserPurger(
+            retention_days=settings.user_purge_retention_days,
+            batch_size=settings.user_purge_batch_size,
+            rows_per_second=settings.user_purge_rows_per_second,
+            interval=settings.user_purge_interval_seconds,
+        )
+        app.state.user_purger.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    purger = getattr(app.state, "user_purger", None)
+    if purger is not None:
+        await purger.stop()
+    shutdown_hash_executor()
+
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(request, exc):
+    # Shed load fast so clients back off instead of piling more work onto the queue.
+    return JSONResponse(
+        status_code=503,
+        content={"message": "Server is busy, please retry shortly."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An unexpected error occurred."})
 
 app.include_router(user_routes.router)
+app.include_router(metrics_routes.router)
 
 
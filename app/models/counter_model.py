@@ -0,0 +1,23 @@
+from builtins import int, str
+from sqlalchemy import BigInteger, Column, String
+from sqlalchemy.orm import Mapped
+from app.database import Base
+
+class RowCounter(Base):
+    """
+    A maintained row count, corresponding to the 'row_counters' table.
+
+    Services that insert or delete rows adjust the matching counter in the same
+    transaction, so reading a total is a primary key lookup instead of a table scan.
+
+    Attributes:
+        name (str): Name of the counted table, e.g. 'users'.
+        value (int): Current number of rows.
+    """
+    __tablename__ = "row_counters"
+
+    name: Mapped[str] = Column(String(50), primary_key=True)
+    value: Mapped[int] = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<RowCounter {self.name}={self.value}>"
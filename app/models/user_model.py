@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 import uuid
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+    DDL, Column, String, Integer, DateTime, Boolean, Index, event, func, text, Enum as SQLAlchemyEnum
 )
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import Mapped, mapped_column
@@ -16,6 +16,9 @@ class UserRole(Enum):
     MANAGER = "MANAGER"
     ADMIN = "ADMIN"
 
+# Columns matched by user search, each backed by a trigram index on its lowercased value.
+SEARCH_FIELDS = ("nickname", "email", "first_name", "last_name")
+
 class User(Base):
     """
     Represents a user within the application, corresponding to the 'users' table in the database.
@@ -42,6 +45,7 @@ class User(Base):
         is_locked (bool): Flag indicating if the account is locked.
         created_at (datetime): Timestamp when the user was created, set by the server.
         updated_at (datetime): Timestamp of the last update, set by the server.
+        deleted_at (datetime): Timestamp of a soft delete; the row is purged later.
 
     Methods:
         lock_account(): Locks the user account.
@@ -52,10 +56,29 @@ class User(Base):
     """
     __tablename__ = "users"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Emails are unique among users that are not soft-deleted and looked up case-insensitively.
+        Index("ix_users_live_email_lower", func.lower(text("email")), unique=True, postgresql_where=text("deleted_at IS NULL")),
+        # Supports keyset pagination ordered by (created_at, id) over users that are not soft-deleted.
+        Index("ix_users_live_created_at_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        # Back the GET /users/ filters and sort keys; the narrow boolean filters get partial indexes.
+        Index("ix_users_live_role_created_at_id", "role", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_users_live_last_login_at_id", "last_login_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_users_locked_created_at_id", "created_at", "id", postgresql_where=text("is_locked AND deleted_at IS NULL")),
+        Index("ix_users_unverified_created_at_id", "created_at", "id", postgresql_where=text("NOT email_verified AND deleted_at IS NULL")),
+        Index("ix_users_professional_created_at_id", "created_at", "id", postgresql_where=text("is_professional AND deleted_at IS NULL")),
+        # Lets the purger find soft-deleted users without scanning live ones.
+        Index("ix_users_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        # Trigram indexes backing prefix and fuzzy matches in user search.
+        *(
+            Index(f"ix_users_{name}_trgm", text(f"lower({name}) gin_trgm_ops"), postgresql_using="gin")
+            for name in SEARCH_FIELDS
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nickname: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
-    email: Mapped[str] = Column(String(255), unique=True, nullable=False, index=True)
+    email: Mapped[str] = Column(String(255), nullable=False)
     first_name: Mapped[str] = Column(String(100), nullable=True)
     last_name: Mapped[str] = Column(String(100), nullable=True)
     bio: Mapped[str] = Column(String(500), nullable=True)
@@ -73,6 +96,7 @@ class User(Base):
     verification_token = Column(String, nullable=True)
     email_verified: Mapped[bool] = Column(Boolean, default=False, nullable=False)
     hashed_password: Mapped[str] = Column(String(255), nullable=False)
+    deleted_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
 
 
     def __repr__(self) -> str:
@@ -95,3 +119,7 @@ class User(Base):
         """Updates the professional status and logs the update time."""
         self.is_professional = status
         self.professional_status_updated_at = func.now()
+
+
+# The trigram indexes need pg_trgm, which migrations install; do the same for create_all.
+event.listen(User.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
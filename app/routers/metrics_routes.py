@@ -0,0 +1,41 @@
+"""
+Operational endpoints exposing in-process telemetry, such as database pool usage, so
+deployments can be sized and tuned without attaching a profiler.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.database import Database
+from app.dependencies import require_role
+from app.schemas.metrics_schema import HashingStatsResponse, NicknameStatsResponse, PoolStatsResponse
+from app.services.user_service import nickname_collisions
+from app.utils.security import get_hash_executor
+
+router = APIRouter()
+
+@router.get("/metrics/db-pool", response_model=PoolStatsResponse, name="db_pool_stats", tags=["Operations Requires (Admin Role)"])
+async def db_pool_stats(replica: bool = False, current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Report connection pool usage: checked-out, idle and overflow connections, checkout
+    timeouts and a histogram of how long requests waited for a connection.
+
+    - **replica**: report the read replica pool instead of the primary.
+    """
+    if replica and not Database.has_read_replica():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No read replica configured")
+    return Database.get_pool_stats(read_replica=replica)
+
+@router.get("/metrics/nicknames", response_model=NicknameStatsResponse, name="nickname_stats", tags=["Operations Requires (Admin Role)"])
+async def nickname_stats(current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Report how often generated nicknames collide with existing ones. A rising collision
+    rate means the nickname space is filling up and registration will need more queries.
+    """
+    return nickname_collisions.snapshot()
+
+@router.get("/metrics/password-hashing", response_model=HashingStatsResponse, name="password_hashing_stats", tags=["Operations Requires (Admin Role)"])
+async def password_hashing_stats(current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Report the password hashing queue: hashes pending and queued, requests shed because
+    the queue was full or their deadline passed, and a histogram of queue wait times.
+    """
+    return get_hash_executor().stats()
@@ -18,26 +18,128 @@ Key Highlights:
 - Utilizes OAuth2PasswordBearer for securing API endpoints, requiring valid access tokens for operations.
 """
 
-from builtins import dict, int, len, str
-from datetime import timedelta
+from builtins import Exception, dict, int, len, str
+import logging
+from datetime import datetime, timedelta
+from typing import Literal, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_current_user, get_db, get_email_service, require_role
+from app.database import Database
+from app.dependencies import get_db, get_email_service, get_read_db, rate_limit, require_role
+from app.models.user_model import User, UserRole
 from app.schemas.pagination_schema import EnhancedPagination
 from app.schemas.token_schema import TokenResponse
-from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserUpdateProfile, UserResponse, UserUpdate
-from app.services.user_service import UserService
+from app.schemas.user_schemas import BulkUserCreate, BulkUserCreateResponse, BulkUserUpdate, BulkUserUpdateResponse, LoginRequest, UserBase, UserCreate, UserFilter, UserListResponse, UserSearchResponse, UserSearchResult, UserUpdateProfile, UserResponse, UserUpdate
+from app.services.user_service import EXPORT_COLUMNS, RESPONSE_COLUMNS, CreateOutcome, LoginOutcome, UserService
 from app.services.jwt_service import create_access_token
-from app.utils.link_generation import create_user_links, generate_pagination_links
+from app.utils.cursor import NEXT, PREV, decode_cursor, decode_search_cursor, encode_cursor, encode_search_cursor
+from app.utils.export import MEDIA_TYPES, format_csv, format_ndjson
+from app.utils.link_generation import create_user_links, generate_pagination_links, generate_search_links
 from app.dependencies import get_settings
 from app.services.email_service import EmailService
 router = APIRouter()
+logger = logging.getLogger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 settings = get_settings()
+# get_user also reads the timestamps alongside the UserResponse fields.
+USER_DETAIL_COLUMNS = RESPONSE_COLUMNS + (User.last_login_at, User.created_at, User.updated_at)
+# Sort orders accepted by GET /users/, mirroring UserService's SORT_KEYS.
+USER_SORT_OPTIONS = (
+    "created_at", "-created_at", "last_login_at", "-last_login_at", "email", "-email", "nickname", "-nickname",
+)
+# Status and message for each way UserService.create_user can fail.
+CREATE_FAILURES = {
+    CreateOutcome.EMAIL_TAKEN: (status.HTTP_409_CONFLICT, "Email already exists"),
+    CreateOutcome.INVALID: (status.HTTP_400_BAD_REQUEST, "Invalid user data"),
+    CreateOutcome.NICKNAME_EXHAUSTED: (status.HTTP_500_INTERNAL_SERVER_ERROR, "Could not allocate a nickname, please try again"),
+}
+
+def raise_create_failure(outcome: CreateOutcome) -> None:
+    status_code, detail = CREATE_FAILURES[outcome]
+    raise HTTPException(status_code=status_code, detail=detail)
+
+# Declared before /users/{user_id} so "export" is not parsed as a user id.
+@router.get("/users/export", name="export_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    role: Optional[UserRole] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+):
+    """
+    Export users as NDJSON or CSV.
+
+    Rows are streamed from a server-side cursor straight into the response, so memory
+    use is constant regardless of how many users are exported.
+
+    - **role**: only export users with this role.
+    - **created_after** / **created_before**: only export users created in this range.
+    """
+    columns = [column.key for column in EXPORT_COLUMNS]
+
+    async def generate():
+        # The request's own session closes before a streamed body is sent, so the
+        # export holds its own session for as long as the stream is open.
+        async with Database.get_read_session_factory()() as session:
+            header = True
+            async for rows in UserService.stream_users(session, role=role, created_after=created_after, created_before=created_before):
+                if format == "csv":
+                    yield format_csv(rows, columns, header=header)
+                    header = False
+                else:
+                    yield format_ndjson(rows)
+            if format == "csv" and header:
+                yield format_csv([], columns, header=True)
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+# Declared before /users/{user_id} so "search" is not parsed as a user id.
+@router.get("/users/search", response_model=UserSearchResponse, name="search_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def search_users(
+    request: Request,
+    q: str = Query(..., min_length=3, max_length=100),
+    limit: int = Query(20, ge=1),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+):
+    """
+    Search users by nickname, email, first or last name.
+
+    Matches fields that start with the query or contain a similar word, using trigram
+    indexes, and returns the best matches first. Results are paged with an opaque cursor.
+
+    - **q**: search term, at least 3 characters so it can use the trigram indexes.
+    - **limit**: page size, capped by the server.
+    - **cursor**: `next_cursor` from the previous page.
+    """
+    limit = min(limit, settings.user_search_max_results)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_search_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    rows, has_more = await UserService.search_users(db, q, limit, after=after, columns=RESPONSE_COLUMNS)
+    next_cursor = encode_search_cursor(rows[-1][1], rows[-1][0].id) if rows and has_more else None
+    return UserSearchResponse(
+        items=[UserSearchResult(**UserResponse.model_validate(user).model_dump(), score=score) for user, score in rows],
+        size=len(rows),
+        next_cursor=next_cursor,
+        links=generate_search_links(request, q, limit, cursor, next_cursor),
+    )
+
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_read_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Endpoint to fetch a user by their unique identifier (UUID).
 
@@ -47,10 +149,10 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
     Args:
         user_id: UUID of the user to fetch.
         request: The request object, used to generate full URLs in the response.
-        db: Dependency that provides an AsyncSession for database access.
+        db: Dependency that provides an AsyncSession routed to the read replica when configured.
         token: The OAuth2 access token obtained through OAuth2PasswordBearer dependency.
     """
-    user = await UserService.get_by_id(db, user_id)
+    user = await UserService.get_by_id(db, user_id, columns=USER_DETAIL_COLUMNS)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -129,8 +231,10 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     Create a new user.
 
     This endpoint creates a new user with the provided information. If the email
-    already exists, it returns a 400 error. On successful creation, it returns the
-    newly created user's information along with links to related actions.
+    already exists, it returns a 409 error; invalid user data returns a 400 error,
+    and a 500 error means no free nickname could be allocated. On successful
+    creation, it returns the newly created user's information along with links to
+    related actions.
 
     Parameters:
     - user (UserCreate): The user information to create.
@@ -140,13 +244,9 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     Returns:
     - UserResponse: The newly created user's information along with navigation links.
     """
-    existing_user = await UserService.get_by_email(db, user.email)
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
-    
-    created_user = await UserService.create(db, user.model_dump(), email_service)
+    created_user, outcome = await UserService.create_user(db, user.model_dump(), email_service)
     if not created_user:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create user")
+        raise_create_failure(outcome)
     
     
     return UserResponse.model_construct(
@@ -167,14 +267,109 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     )
 
 
+@router.post("/users/bulk", response_model=BulkUserCreateResponse, tags=["User Management Requires (Admin or Manager Roles)"], name="bulk_create_users")
+async def bulk_create_users(payload: BulkUserCreate, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Create many users in one request.
+
+    All items are validated up front. Email and nickname conflicts are resolved with
+    set-based queries, taken or missing nicknames are replaced with generated ones and
+    the new rows are inserted with a single statement. Verification emails are sent in
+    the background after the response.
+
+    Returns one result per item, in request order.
+    """
+    if len(payload.users) > settings.bulk_user_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_user_max_items} users can be created per request."
+        )
+
+    results, created_users = await UserService.create_many(db, payload.users)
+    for created_user in created_users:
+        background_tasks.add_task(_send_verification_email, email_service, created_user)
+
+    return BulkUserCreateResponse(
+        created=len(created_users),
+        failed=len(results) - len(created_users),
+        results=results,
+    )
+
+
+@router.patch("/users/bulk", response_model=BulkUserUpdateResponse, tags=["User Management Requires (Admin or Manager Roles)"], name="bulk_update_users")
+async def bulk_update_users(payload: BulkUserUpdate, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Set the role, lock state and/or professional status of many users at once.
+
+    The change is applied with a single UPDATE. Professional status notifications are
+    sent in the background after the response.
+    """
+    if len(payload.ids) > settings.bulk_user_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_user_max_items} users can be updated per request."
+        )
+
+    rows = await UserService.bulk_update(
+        db, payload.ids, role=payload.role, is_locked=payload.is_locked, is_professional=payload.is_professional
+    )
+    if payload.is_professional is not None:
+        for row in rows:
+            user = User(id=row.id, email=row.email, first_name=row.first_name, is_professional=row.is_professional)
+            background_tasks.add_task(_send_professional_status_email, email_service, user)
+
+    updated_ids = [row.id for row in rows]
+    updated = set(updated_ids)
+    return BulkUserUpdateResponse(
+        updated=len(updated_ids),
+        updated_ids=updated_ids,
+        not_found_ids=[user_id for user_id in dict.fromkeys(payload.ids) if user_id not in updated],
+    )
+
+
+async def _send_professional_status_email(email_service: EmailService, user: User):
+    try:
+        await email_service.send_professional_status_email_update(user)
+    except Exception as e:
+        logger.error(f"Error sending professional status update email to {user.email}: {e}")
+
+
+async def _send_verification_email(email_service: EmailService, user: User):
+    try:
+        await email_service.send_verification_email(user)
+    except Exception as e:
+        logger.error(f"Error sending verification email to {user.email}: {e}")
+
+
 @router.get("/users/", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
 async def list_users(
     request: Request,
     skip: int = 0,
     limit: int = 20,
-    db: AsyncSession = Depends(get_db),
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: Optional[str] = None,
+    count: Optional[Literal["exact", "estimated", "counter"]] = None,
+    sort: Literal[USER_SORT_OPTIONS] = "created_at",
+    filters: UserFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
+    """
+    List users.
+
+    Offset mode (the default) pages with `skip`/`limit`. Cursor mode, selected with
+    `pagination=cursor` or by passing a `cursor` from a previous response, pages by
+    (created_at, id) so deep pages cost the same as the first one.
+
+    Results can be narrowed by role, lock, verification and professional status and by
+    creation or last login time. `sort` orders offset pages by created_at,
+    last_login_at, email or nickname; prefix it with '-' for descending order. Cursor
+    mode always follows created_at.
+
+    `count` picks how `total` is computed (defaults to the `user_count_strategy`
+    setting); `count_strategy` in the response reports the one actually used, which is
+    always exact when filters are given.
+    """
 
     # Validate skip and limit parameters
     if skip < 0 or limit <= 0:
@@ -183,54 +378,89 @@ async def list_users(
             detail=f"Parameters 'skip' and 'limit' must be non-negative integers. Received skip={skip} and limit={limit}."
         )
 
-    total_users = await UserService.count(db)
+    cursor_mode = cursor is not None or pagination == "cursor"
+    if cursor_mode and sort != "created_at":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor pagination only supports sort=created_at.")
 
-    users = await UserService.list_users(db, skip, limit)
+    total_users, count_strategy = await UserService.count_users(db, count or settings.user_count_strategy, filters)
+    # Filters and sort order are carried over to the pagination links.
+    query_params = filters.model_dump(mode="json", exclude_none=True)
+    if sort != "created_at":
+        query_params["sort"] = sort
+
+    if cursor_mode:
+        return await _list_users_by_cursor(request, db, limit, cursor, total_users, count_strategy, filters, query_params)
+
+    users = await UserService.list_users(db, skip, limit, columns=RESPONSE_COLUMNS, filters=filters, sort=sort)
     user_responses = [
         UserResponse.model_validate(user) for user in users
     ]
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
+    pagination_links = generate_pagination_links(request, skip, limit, total_users, query_params=query_params)
 
     # Construct the final response with pagination details
     return UserListResponse(
         items=user_responses,
         total=total_users,
+        count_strategy=count_strategy,
         page=skip // limit + 1,
         size=len(user_responses),
         links=pagination_links  # Ensure you have appropriate logic to create these links
     )
 
 
-@router.post("/register/", response_model=UserResponse, tags=["Login and Registration"])
-async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service)):
-    user = await UserService.register_user(session, user_data.model_dump(), email_service)
-    if user:
-        return user
-    raise HTTPException(status_code=400, detail="Email already exists")
+async def _list_users_by_cursor(request: Request, db: AsyncSession, limit: int, cursor: Optional[str], total_users: int, count_strategy: str, filters: UserFilter, query_params: dict) -> UserListResponse:
+    direction, key = NEXT, None
+    if cursor is not None:
+        try:
+            direction, key = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"])
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
-        raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
+    if direction == PREV:
+        users, has_more = await UserService.list_users_keyset(db, limit, before=key, columns=RESPONSE_COLUMNS, filters=filters)
+        has_next, has_prev = True, has_more
+    else:
+        users, has_more = await UserService.list_users_keyset(db, limit, after=key, columns=RESPONSE_COLUMNS, filters=filters)
+        has_next, has_prev = has_more, key is not None
 
-    user = await UserService.login_user(session, form_data.username, form_data.password)
-    if user:
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    next_cursor = encode_cursor(users[-1].created_at, users[-1].id, NEXT) if users and has_next else None
+    prev_cursor = encode_cursor(users[0].created_at, users[0].id, PREV) if users and has_prev else None
+    return UserListResponse(
+        items=[UserResponse.model_validate(user) for user in users],
+        total=total_users,
+        count_strategy=count_strategy,
+        size=len(users),
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        links=generate_pagination_links(
+            request, 0, limit, total_users,
+            cursor=cursor, next_cursor=next_cursor, prev_cursor=prev_cursor, cursor_mode=True,
+            query_params=query_params,
+        ),
+    )
 
-        access_token = create_access_token(
-            data={"sub": user.email, "role": str(user.role.name)},
-            expires_delta=access_token_expires
-        )
 
-        return {"access_token": access_token, "token_type": "bearer"}
-    raise HTTPException(status_code=401, detail="Incorrect email or password.")
+login_rate_limit = rate_limit(
+    "login", "username", settings.login_rate_limit_per_ip, settings.login_rate_limit_per_account,
+    settings.rate_limit_window_seconds, settings.trusted_proxies.split(","),
+)
+register_rate_limit = rate_limit(
+    "register", "email", settings.register_rate_limit_per_ip, settings.register_rate_limit_per_email,
+    settings.rate_limit_window_seconds, settings.trusted_proxies.split(","),
+)
 
-@router.post("/login/", include_in_schema=False, response_model=TokenResponse, tags=["Login and Registration"])
+@router.post("/register/", response_model=UserResponse, tags=["Login and Registration"], dependencies=[Depends(register_rate_limit)])
+async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service)):
+    user, outcome = await UserService.create_user(session, user_data.model_dump(), email_service)
+    if user:
+        return user
+    raise_create_failure(outcome)
+
+@router.post("/login/", response_model=TokenResponse, tags=["Login and Registration"], dependencies=[Depends(login_rate_limit)])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: AsyncSession = Depends(get_db)):
-    if await UserService.is_account_locked(session, form_data.username):
+    user, outcome = await UserService.authenticate(session, form_data.username, form_data.password)
+    if outcome == LoginOutcome.LOCKED:
         raise HTTPException(status_code=400, detail="Account locked due to too many failed login attempts.")
-
-    user = await UserService.login_user(session, form_data.username, form_data.password)
     if user:
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
 
@@ -286,10 +516,8 @@ async def update_profile(
         UserResponse: Updated user profile information with links for related operations.
     """
 
-    # Retrieve the current user based on the email in the OAuth2 token
-    current_user_info = get_current_user(token)
-    user_email = current_user_info['user_email']
-    user = await UserService.get_by_email(db, user_email)
+    # The principal resolved by require_role already carries the email from the token
+    user = await UserService.get_by_email(db, current_user["user_email"])
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -349,18 +577,15 @@ async def update_professional_status(user_id: UUID, is_professional: bool, reque
         UserResponse: Updated user profile data, including the new professional status and relevant HATEOAS links.
     """
 
-    # Retrieve the target user by their ID
-    user = await UserService.get_by_id(db, user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-
     # Perform the update operation on the 'is_professional' field
     updated_user = await UserService.update_professional_status(
-        db=db,
+        db,
         user_id=user_id,
         is_professional=is_professional,
         email_service=email_service
     )
+    if not updated_user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     # Return the updated user profile with HATEOAS links
     return UserResponse.model_construct(
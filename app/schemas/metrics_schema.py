@@ -0,0 +1,33 @@
+from builtins import float, int, str
+from typing import Dict
+from pydantic import BaseModel, Field
+
+class HistogramSnapshot(BaseModel):
+    buckets: Dict[str, int] = Field(..., description="Cumulative observation counts keyed by upper bound in seconds.")
+    count: int = Field(..., description="Total number of observations.")
+    sum: float = Field(..., description="Sum of all observations in seconds.")
+
+class PoolStatsResponse(BaseModel):
+    pool_size: int = Field(..., example=5, description="Configured number of persistent connections.")
+    max_overflow: int = Field(..., example=10, description="Connections allowed beyond the pool size.")
+    checked_out: int = Field(..., example=3, description="Connections currently in use.")
+    idle: int = Field(..., example=2, description="Connections open and waiting in the pool.")
+    overflow: int = Field(..., example=0, description="Overflow connections currently open.")
+    checkout_timeouts: int = Field(..., example=0, description="Checkouts that gave up after the pool timeout.")
+    checkout_wait_seconds: HistogramSnapshot
+
+class NicknameStatsResponse(BaseModel):
+    allocations: int = Field(..., example=120, description="Nicknames generated for users since startup.")
+    candidates: int = Field(..., example=600, description="Generated candidates checked against the database.")
+    collisions: int = Field(..., example=3, description="Candidates rejected because the nickname was already taken.")
+    collision_rate: float = Field(..., example=0.005, description="Share of checked candidates that collided.")
+    rounds: int = Field(..., example=120, description="Availability queries issued; stays close to the allocation count while collisions are rare.")
+
+class HashingStatsResponse(BaseModel):
+    workers: int = Field(..., example=4, description="Hashes that can run at once.")
+    max_pending: int = Field(..., example=64, description="Hashes allowed queued or running before requests are shed.")
+    pending: int = Field(..., example=6, description="Hashes currently queued or running.")
+    queued: int = Field(..., example=2, description="Hashes waiting for a free worker.")
+    rejected: int = Field(..., example=0, description="Requests shed because the queue was full.")
+    expired: int = Field(..., example=0, description="Requests shed because their hash could not start before the deadline.")
+    queue_wait_seconds: HistogramSnapshot
@@ -8,6 +8,7 @@ from enum import Enum
 import uuid
 import re
 from app.models.user_model import UserRole
+from app.schemas.pagination_schema import PaginationLink
 from app.utils.nickname_gen import generate_nickname
 
 
@@ -109,8 +110,64 @@ class UserListResponse(BaseModel):
         "github_profile_url": "https://github.com/johndoe"
     }])
     total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
+    count_strategy: str = Field("exact", example="exact", description="How total was computed: exact, estimated or counter.")
+    page: Optional[int] = Field(None, example=1, description="Page number in offset mode; omitted in cursor mode.")
     size: int = Field(..., example=10)
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the following page in cursor mode.")
+    prev_cursor: Optional[str] = Field(None, description="Opaque cursor for the preceding page in cursor mode.")
+    links: List[PaginationLink] = []
+
+class UserFilter(BaseModel):
+    """Optional filters for user listings; every field left unset is ignored."""
+    role: Optional[UserRole] = Field(None, description="Only users with this role.")
+    is_locked: Optional[bool] = Field(None, description="Only locked (true) or unlocked (false) users.")
+    email_verified: Optional[bool] = Field(None, description="Only users whose email is (or is not) verified.")
+    is_professional: Optional[bool] = Field(None, description="Only users with (or without) professional status.")
+    created_after: Optional[datetime] = Field(None, description="Only users created at or after this time.")
+    created_before: Optional[datetime] = Field(None, description="Only users created before this time.")
+    last_login_after: Optional[datetime] = Field(None, description="Only users who last logged in at or after this time.")
+    last_login_before: Optional[datetime] = Field(None, description="Only users who last logged in before this time.")
+
+class UserSearchResult(UserResponse):
+    score: float = Field(..., example=0.83, description="Relevance of the match; 1.0 for a prefix match.")
+
+class UserSearchResponse(BaseModel):
+    items: List[UserSearchResult]
+    size: int = Field(..., example=10)
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the following page of results.")
+    links: List[PaginationLink] = []
+
+class BulkUserCreate(BaseModel):
+    users: List[UserCreate] = Field(..., min_length=1, description="Users to create; every item is validated before any is inserted.")
+
+class BulkUserCreateResult(BaseModel):
+    index: int = Field(..., example=0, description="Position of the item in the request.")
+    email: EmailStr = Field(..., example="john.doe@example.com")
+    status: str = Field(..., example="created", description="created, duplicate_email or conflict.")
+    id: Optional[uuid.UUID] = Field(None, example=uuid.uuid4())
+    nickname: Optional[str] = Field(None, example=generate_nickname(), description="Assigned nickname; generated when the requested one was taken.")
+
+class BulkUserCreateResponse(BaseModel):
+    created: int = Field(..., example=2)
+    failed: int = Field(..., example=1)
+    results: List[BulkUserCreateResult]
+
+class BulkUserUpdate(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, description="Users to update.")
+    role: Optional[UserRole] = Field(None, example="AUTHENTICATED")
+    is_locked: Optional[bool] = Field(None, example=False)
+    is_professional: Optional[bool] = Field(None, example=True)
+
+    @root_validator(pre=True)
+    def check_at_least_one_change(cls, values):
+        if all(values.get(field) is None for field in ("role", "is_locked", "is_professional")):
+            raise ValueError("At least one of role, is_locked or is_professional must be provided")
+        return values
+
+class BulkUserUpdateResponse(BaseModel):
+    updated: int = Field(..., example=2)
+    updated_ids: List[uuid.UUID]
+    not_found_ids: List[uuid.UUID]
 
 # New Feature: Class for updating user profile
 class UserUpdateProfile(BaseModel):
@@ -1,7 +1,12 @@
 # app/services/jwt_service.py
-from builtins import dict, str
+from builtins import dict, float, int, isinstance, len, min, str
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 import jwt
 from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
 from settings.config import settings
 
 def create_access_token(*, data: dict, expires_delta: timedelta = None):
@@ -20,3 +25,63 @@ def decode_token(token: str):
         return decoded
     except jwt.PyJWTError:
         return None
+
+class TokenClaimsCache:
+    """
+    Verified claims keyed by the SHA-256 digest of the token, so raw tokens are not
+    kept in memory. Holds at most `max_size` tokens, evicting the least recently used,
+    and trusts each one for `ttl` seconds but never past its `exp`. Tokens that fail
+    verification are not cached.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = self._clock() + self.ttl
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"])
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+claims_cache = TokenClaimsCache(settings.jwt_claims_cache_size, settings.jwt_claims_cache_ttl_seconds)
+
+def decode_token_cached(token: str):
+    """`decode_token`, skipping signature verification for tokens verified recently."""
+    claims = claims_cache.get(token)
+    if claims is None:
+        claims = decode_token(token)
+        if claims is not None:
+            claims_cache.put(token, claims)
+    return claims
@@ -0,0 +1,65 @@
+from builtins import float, int
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.database import Database
+from app.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+class UserPurger:
+    """
+    Background task that hard-deletes soft-deleted users past their retention period.
+
+    Rows are removed in batches of at most `batch_size`, one short transaction each,
+    and batches are spaced so the purge never exceeds `rows_per_second`. When a batch
+    comes back short there is nothing left to purge and the task sleeps for `interval`.
+    """
+
+    def __init__(self, retention_days: int, batch_size: int, rows_per_second: float, interval: float):
+        self.retention = timedelta(days=retention_days)
+        self.batch_size = batch_size
+        self.rows_per_second = rows_per_second
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def purge_once(self) -> int:
+        """Purge eligible users until none are left, returning how many were removed."""
+        session_factory = Database.get_session_factory()
+        deleted_before = datetime.now(timezone.utc) - self.retention
+        total = 0
+        while True:
+            async with session_factory() as session:
+                removed = await UserService.purge_deleted(session, deleted_before, self.batch_size)
+            total += removed
+            if removed < self.batch_size:
+                return total
+            if self.rows_per_second > 0:
+                await asyncio.sleep(removed / self.rows_per_second)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                removed = await self.purge_once()
+                if removed:
+                    logger.info(f"Purged {removed} soft-deleted users.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"User purge failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,16 +1,26 @@
 from builtins import Exception, bool, classmethod, int, str
+from enum import Enum
+import uuid
 from datetime import datetime, timezone
 import secrets
-from typing import Optional, Dict, List
-from pydantic import ValidationError
-from sqlalchemy import func, null, update, select
-from sqlalchemy.exc import SQLAlchemyError
+from typing import AsyncIterator, Optional, Dict, List, Sequence, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Float, and_, any_, bindparam, case, cast, delete, func, literal, not_, null, or_, update, select, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from app.dependencies import get_email_service, get_settings
-from app.models.user_model import User
-from app.schemas.user_schemas import UserCreate, UserUpdate
-from app.utils.nickname_gen import generate_nickname
-from app.utils.security import generate_verification_token, hash_password, verify_password
+from app.models.counter_model import RowCounter
+from app.models.user_model import SEARCH_FIELDS, User
+from app.schemas.user_schemas import UserCreate, UserFilter, UserResponse, UserUpdate
+from app.utils.hash_executor import HashingOverloadedError
+from app.utils.metrics import CollisionCounter
+from app.utils.nickname_gen import generate_nicknames
+from app.utils.security import (
+    generate_verification_token, hash_password_async, hash_passwords_async, password_needs_rehash, verify_password_async,
+)
 from uuid import UUID
 from app.services.email_service import EmailService
 from app.models.user_model import UserRole
@@ -19,7 +29,92 @@ import logging
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+def constraint_name(error: IntegrityError) -> Optional[str]:
+    """Return the name of the constraint behind an IntegrityError, as reported by the driver."""
+    orig = error.orig
+    return getattr(orig, "constraint_name", None) or getattr(orig.__cause__, "constraint_name", None)
+
+def filter_criteria(filters: Optional[UserFilter]) -> List:
+    """Translate a UserFilter into WHERE criteria, skipping the fields left unset."""
+    if filters is None:
+        return []
+    criteria = []
+    if filters.role is not None:
+        criteria.append(User.role == filters.role)
+    # Booleans are emitted as literal predicates rather than bound parameters so the
+    # planner can match the partial indexes even with generic prepared-statement plans.
+    for name in ("is_locked", "email_verified", "is_professional"):
+        value = getattr(filters, name)
+        if value is not None:
+            column = getattr(User, name)
+            criteria.append(column if value else not_(column))
+    if filters.created_after is not None:
+        criteria.append(User.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        criteria.append(User.created_at < filters.created_before)
+    if filters.last_login_after is not None:
+        criteria.append(User.last_login_at >= filters.last_login_after)
+    if filters.last_login_before is not None:
+        criteria.append(User.last_login_at < filters.last_login_before)
+    return criteria
+
+def schema_columns(schema: Type[BaseModel]) -> Tuple:
+    """Return the User columns backing the fields of `schema`, for projected queries."""
+    column_names = User.__mapper__.column_attrs.keys()
+    return tuple(getattr(User, name) for name in schema.model_fields if name in column_names)
+
+# Columns serialized by UserResponse; list and lookup endpoints load only these.
+RESPONSE_COLUMNS = schema_columns(UserResponse)
+# Columns written by the user export.
+EXPORT_COLUMNS = RESPONSE_COLUMNS + (
+    User.email_verified, User.is_locked, User.last_login_at, User.created_at, User.updated_at,
+)
+# Collision statistics for generated nicknames, reported by the metrics router.
+nickname_collisions = CollisionCounter()
+# Sort keys accepted by list_users, each backed by an index; ties are broken by id.
+SORT_KEYS = {
+    "created_at": User.created_at,
+    "last_login_at": User.last_login_at,
+    "email": func.lower(User.email),
+    "nickname": User.nickname,
+}
+# Unique indexes whose violation means the email is already registered.
+EMAIL_CONSTRAINTS = frozenset({"ix_users_live_email_lower"})
+# Filter every lookup applies so soft-deleted users are invisible until purged.
+NOT_DELETED = User.deleted_at.is_(None)
+# Columns the login path reads and writes.
+AUTH_COLUMNS = (
+    User.id, User.email, User.role, User.hashed_password, User.email_verified,
+    User.is_locked, User.failed_login_attempts,
+)
+
+class CreateOutcome(str, Enum):
+    """Result of creating a user, as decided by UserService.create_user."""
+    CREATED = "created"
+    EMAIL_TAKEN = "email_taken"
+    NICKNAME_EXHAUSTED = "nickname_exhausted"
+    INVALID = "invalid"
+
+class LoginOutcome(str, Enum):
+    """Result of a login attempt, as decided by UserService.authenticate."""
+    SUCCESS = "success"
+    LOCKED = "locked"
+    UNVERIFIED = "unverified"
+    INVALID = "invalid"
+
+
 class UserService:
+    # Below this many rows the planner estimate is too coarse to be useful and an exact count is cheap.
+    ESTIMATE_MIN_ROWS = 10000
+    # Extra nickname candidates checked per allocation round so a collision rarely costs another query.
+    NICKNAME_SPARE_CANDIDATES = 4
+    # Inserts retried with a fresh nickname before create gives up on a nickname conflict.
+    NICKNAME_INSERT_ATTEMPTS = 5
+    # Advisory lock key serializing the first-user (bootstrap admin) check across processes.
+    BOOTSTRAP_LOCK_KEY = 0x75736572  # "user"
+    # Set once any user is known to exist; from then on no registration checks again.
+    _admin_bootstrapped = False
+
     @classmethod
     async def _execute_query(cls, session: AsyncSession, query):
         try:
@@ -32,81 +127,250 @@ class UserService:
             return None
 
     @classmethod
-    async def _fetch_user(cls, session: AsyncSession, **filters) -> Optional[User]:
+    async def _execute_read(cls, session: AsyncSession, query):
+        """
+        Run a read-only query without committing. The transaction it opens is ended by the
+        caller's next commit or when the session closes, so a lookup costs one round trip.
+        """
+        try:
+            return await session.execute(query)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {e}")
+            await session.rollback()
+            return None
+
+    @classmethod
+    async def _fetch_user(cls, session: AsyncSession, columns: Optional[Sequence] = None, include_deleted: bool = False, **filters) -> Optional[User]:
+        """
+        Fetch a single user. With `columns`, only those columns are loaded; reading any
+        other attribute afterwards is an error in async code, so pass every column used.
+        Soft-deleted users are skipped unless `include_deleted` is set.
+        """
+        email = filters.pop("email", None)
         query = select(User).filter_by(**filters)
-        result = await cls._execute_query(session, query)
+        if email is not None:
+            # Matches case-insensitively, through the unique lower(email) index.
+            query = query.where(func.lower(User.email) == email.lower())
+        if not include_deleted:
+            query = query.where(NOT_DELETED)
+        if columns:
+            query = query.options(load_only(*columns))
+        result = await cls._execute_read(session, query)
         return result.scalars().first() if result else None
 
     @classmethod
-    async def get_by_id(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
-        return await cls._fetch_user(session, id=user_id)
+    async def get_by_id(cls, session: AsyncSession, user_id: UUID, columns: Optional[Sequence] = None) -> Optional[User]:
+        return await cls._fetch_user(session, columns, id=user_id)
 
     @classmethod
     async def get_by_nickname(cls, session: AsyncSession, nickname: str) -> Optional[User]:
         return await cls._fetch_user(session, nickname=nickname)
 
     @classmethod
-    async def get_by_email(cls, session: AsyncSession, email: str) -> Optional[User]:
-        return await cls._fetch_user(session, email=email)
+    async def get_by_email(cls, session: AsyncSession, email: str, columns: Optional[Sequence] = None) -> Optional[User]:
+        return await cls._fetch_user(session, columns, email=email)
 
     @classmethod
     async def create(cls, session: AsyncSession, user_data: Dict[str, str], email_service: EmailService) -> Optional[User]:
+        user, _ = await cls.create_user(session, user_data, email_service)
+        return user
+
+    @classmethod
+    async def create_user(
+        cls, session: AsyncSession, user_data: Dict[str, str], email_service: EmailService
+    ) -> Tuple[Optional[User], CreateOutcome]:
+        """
+        Create a user with a single `INSERT ... ON CONFLICT (nickname) DO NOTHING RETURNING`.
+
+        There is no lookup beforehand: a duplicate email surfaces as a unique violation,
+        classified by constraint name, and a taken nickname returns no row, in which case
+        the insert is retried with a generated one.
+
+        :return: The new user (None unless the outcome is CREATED) and the outcome.
+        """
         try:
             validated_data = UserCreate(**user_data).model_dump()
-            existing_user = await cls.get_by_email(session, validated_data['email'])
-            if existing_user:
-                logger.error("User with given email already exists.")
-                return None
+        except ValidationError as e:
+            logger.error(f"Validation error during user creation: {e}")
+            return None, CreateOutcome.INVALID
 
-            validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
+        validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+        validated_data['role'] = await cls._bootstrap_role(session)
+        logger.info(f"User Role: {validated_data['role']}")
+        if validated_data['role'] == UserRole.ADMIN:
+            validated_data['email_verified'] = True
+        else:
+            validated_data['verification_token'] = generate_verification_token()
 
-            # Use provided nickname if it doesn't exist, otherwise generate a new one
-            nickname = validated_data.get('nickname')
-            if await cls.get_by_nickname(session, nickname):
-                # Generate a new unique nickname if the provided one is already taken
-                new_nickname = generate_nickname()
-                while await cls.get_by_nickname(session, new_nickname):
-                    new_nickname = generate_nickname()
-                validated_data['nickname'] = new_nickname
-            else:
-                validated_data['nickname'] = nickname  # Use the provided nickname as it is unique
+        # Use provided nickname if it is free, otherwise retry with generated ones
+        requested_nickname = validated_data.pop('nickname', None)
+        nicknames = [requested_nickname] if requested_nickname else []
+        nicknames += generate_nicknames(cls.NICKNAME_INSERT_ATTEMPTS - len(nicknames))
+        new_user = None
+        attempts = 0
+        for nickname in nicknames:
+            attempts += 1
+            query = (
+                pg_insert(User)
+                .values(**validated_data, nickname=nickname)
+                .on_conflict_do_nothing(index_elements=[User.nickname])
+                .returning(User)
+            )
+            try:
+                new_user = (await session.execute(query)).scalar()
+            except IntegrityError as e:
+                await session.rollback()
+                if constraint_name(e) in EMAIL_CONSTRAINTS:
+                    logger.error("User with given email already exists.")
+                    return None, CreateOutcome.EMAIL_TAKEN
+                raise
+            if new_user is not None:
+                break
+        allocated = 0 if new_user is None else 1
+        nickname_collisions.record(allocated, attempts, attempts - allocated, attempts)
+        if new_user is None:
+            await session.rollback()
+            logger.error("Could not find a free nickname for the new user.")
+            return None, CreateOutcome.NICKNAME_EXHAUSTED
+
+        await cls._adjust_user_count(session, 1)
+        await session.commit()
+        cls._admin_bootstrapped = True
+        if new_user.role != UserRole.ADMIN:
+            try:
+                await email_service.send_verification_email(new_user)
+            except Exception as e:
+                logger.error(f"Error sending verification email: {e}")
+        return new_user, CreateOutcome.CREATED
 
-            new_user = User(**validated_data)
-            logger.info(f"User Role: {new_user.role}")
-            user_count = await cls.count(session)
-            new_user.role = UserRole.ADMIN if user_count == 0 else UserRole.ANONYMOUS
+    @classmethod
+    async def _bootstrap_role(cls, session: AsyncSession) -> UserRole:
+        """
+        Return ADMIN for the very first user and ANONYMOUS for everyone else.
 
-            session.add(new_user)
+        Until a user is known to exist, the check takes a transaction-level advisory lock,
+        held until the caller commits its insert, so concurrent first registrations queue up
+        and only one of them sees an empty table. Once any user exists the answer is cached
+        and registrations skip the database entirely.
+        """
+        if cls._admin_bootstrapped:
+            return UserRole.ANONYMOUS
+        await session.execute(select(func.pg_advisory_xact_lock(cls.BOOTSTRAP_LOCK_KEY)))
+        if await session.scalar(select(select(User.id).exists())):
+            cls._admin_bootstrapped = True
+            return UserRole.ANONYMOUS
+        return UserRole.ADMIN
 
-            if new_user.role != UserRole.ADMIN:
-                new_user.verification_token = generate_verification_token()
-                await session.commit()
-                try:
-                    await email_service.send_verification_email(new_user)
-                except Exception as e:
-                    logger.error(f"Error sending verification email: {e}")
+    @classmethod
+    async def create_many(cls, session: AsyncSession, users_data: List[UserCreate]) -> Tuple[List[Dict], List[User]]:
+        """
+        Create many users with a fixed number of round trips.
+
+        Existing emails and nicknames are resolved with one `IN` query each, passwords are
+        hashed concurrently off the event loop and all new rows go in a single multi-row
+        `INSERT ... ON CONFLICT DO NOTHING RETURNING`. Users are created unverified with
+        the ANONYMOUS role, as `create` does for everyone but the first user.
+
+        :return: One result per input, in order, with `status` of 'created',
+            'duplicate_email' or 'conflict' (lost a race with a concurrent insert), and the
+            created users, which still need their verification email.
+        """
+        results = [{"index": i, "email": data.email, "status": None, "id": None, "nickname": None} for i, data in enumerate(users_data)]
+
+        emails = [data.email.lower() for data in users_data]
+        existing_emails = set((await session.execute(
+            select(func.lower(User.email)).where(func.lower(User.email).in_(emails), NOT_DELETED)
+        )).scalars())
+        seen_emails = set()
+        pending = []
+        for result, data, email in zip(results, users_data, emails):
+            if email in existing_emails or email in seen_emails:
+                result["status"] = "duplicate_email"
             else:
-                new_user.email_verified = True
-                await session.commit()
+                seen_emails.add(email)
+                pending.append((result, data))
 
-            return new_user
-        except ValidationError as e:
-            logger.error(f"Validation error during user creation: {e}")
-            return None
+        requested = [data.nickname for _, data in pending if data.nickname]
+        taken = set((await session.execute(select(User.nickname).where(User.nickname.in_(requested)))).scalars()) if requested else set()
+        needs_nickname = []
+        for result, data in pending:
+            if data.nickname and data.nickname not in taken:
+                taken.add(data.nickname)
+                result["nickname"] = data.nickname
+            else:
+                needs_nickname.append(result)
+        for result, nickname in zip(needs_nickname, await cls._allocate_nicknames(session, len(needs_nickname), taken)):
+            result["nickname"] = nickname
+
+        hashed_passwords = await hash_passwords_async([data.password for _, data in pending])
+
+        rows = []
+        for (result, data), hashed_password in zip(pending, hashed_passwords):
+            row = data.model_dump(exclude={"password", "role"})
+            row.update(
+                id=uuid.uuid4(),
+                nickname=result["nickname"],
+                hashed_password=hashed_password,
+                role=UserRole.ANONYMOUS,
+                verification_token=generate_verification_token(),
+                email_verified=False,
+                is_professional=False,
+                is_locked=False,
+                failed_login_attempts=0,
+            )
+            result["id"] = row["id"]
+            rows.append(row)
+
+        created_users = []
+        if rows:
+            query = pg_insert(User).values(rows).on_conflict_do_nothing().returning(User.id)
+            inserted_ids = set((await session.execute(query)).scalars())
+            await cls._adjust_user_count(session, len(inserted_ids))
+            await session.commit()
+            for (result, _), row in zip(pending, rows):
+                if row["id"] in inserted_ids:
+                    result["status"] = "created"
+                    created_users.append(User(**row))
+                else:
+                    result.update(status="conflict", id=None, nickname=None)
+        logger.info(f"Bulk created {len(created_users)} of {len(users_data)} users.")
+        return results, created_users
+
+    @classmethod
+    async def _allocate_nicknames(cls, session: AsyncSession, count: int, taken: set) -> List[str]:
+        """
+        Generate `count` nicknames that are neither in `taken` nor in the database.
+
+        Each round checks a batch of candidates, with a few spare ones to absorb collisions,
+        in a single `IN` query, so an allocation almost always costs one round trip.
+        """
+        allocated = []
+        candidates_checked = collisions = rounds = 0
+        while len(allocated) < count:
+            needed = count - len(allocated)
+            candidates = [name for name in generate_nicknames(needed + cls.NICKNAME_SPARE_CANDIDATES) if name not in taken]
+            existing = set((await session.execute(select(User.nickname).where(User.nickname.in_(candidates)))).scalars())
+            rounds += 1
+            candidates_checked += len(candidates)
+            collisions += len(existing)
+            for candidate in candidates:
+                if candidate not in existing and len(allocated) < count:
+                    taken.add(candidate)
+                    allocated.append(candidate)
+        nickname_collisions.record(len(allocated), candidates_checked, collisions, rounds)
+        return allocated
 
     @classmethod
     async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
+        """Apply `update_data` with a single `UPDATE ... RETURNING` and return the updated user."""
         try:
             # validated_data = UserUpdate(**update_data).dict(exclude_unset=True)
             validated_data = UserUpdate(**update_data).model_dump(exclude_unset=True)
 
             if 'password' in validated_data:
-                validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-            query = update(User).where(User.id == user_id).values(**validated_data).execution_options(synchronize_session="fetch")
-            await cls._execute_query(session, query)
-            updated_user = await cls.get_by_id(session, user_id)
+                validated_data['hashed_password'] = await hash_password_async(validated_data.pop('password'))
+            updated_user = await cls._update_returning(session, user_id, validated_data)
             if updated_user:
-                session.refresh(updated_user)  # Explicitly refresh the updated user object
                 logger.info(f"User {user_id} updated successfully.")
                 return updated_user
             else:
@@ -117,57 +381,302 @@ class UserService:
             return None
 
     @classmethod
-    async def delete(cls, session: AsyncSession, user_id: UUID) -> bool:
+    async def _update_returning(cls, session: AsyncSession, user_id: UUID, values: Dict, *criteria) -> Optional[User]:
+        """
+        Update one live user and commit, returning the row as written, or None if there is
+        no such user or it does not match the extra `criteria`.
+        """
+        query = (
+            update(User)
+            .where(User.id == user_id, NOT_DELETED, *criteria)
+            .values(**values)
+            .returning(User)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await cls._execute_query(session, query)
+        return result.scalar() if result else None
+
+    @classmethod
+    async def bulk_update(
+        cls,
+        session: AsyncSession,
+        user_ids: List[UUID],
+        role: Optional[UserRole] = None,
+        is_locked: Optional[bool] = None,
+        is_professional: Optional[bool] = None,
+    ) -> List:
+        """
+        Apply the same role, lock or professional status change to many users with a
+        single `UPDATE ... WHERE id = ANY(:ids) RETURNING`.
+
+        Unlocking also resets failed login attempts, and changing professional status
+        stamps `professional_status_updated_at`.
+
+        :return: Rows (id, email, first_name, is_professional) for the users that were updated.
+        """
+        values = {}
+        if role is not None:
+            values["role"] = role
+        if is_locked is not None:
+            values["is_locked"] = is_locked
+            if not is_locked:
+                values["failed_login_attempts"] = 0
+        if is_professional is not None:
+            values["is_professional"] = is_professional
+            values["professional_status_updated_at"] = func.now()
+        if not values or not user_ids:
+            return []
+
+        ids = bindparam("ids", list(user_ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+        query = (
+            update(User)
+            .where(User.id == any_(ids), NOT_DELETED)
+            .values(**values)
+            .returning(User.id, User.email, User.first_name, User.is_professional)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(query)
+        rows = result.all()
+        await session.commit()
+        logger.info(f"Bulk updated {len(rows)} of {len(user_ids)} users: {sorted(values)}")
+        return rows
+
+    @classmethod
+    async def delete(cls, session: AsyncSession, user_id: UUID, soft: Optional[bool] = None) -> bool:
+        """
+        Delete a user. A soft delete (the default when `user_soft_delete` is enabled) only
+        stamps `deleted_at` in a single UPDATE; the row is removed later by the purger. The
+        email is released immediately and can be registered again.
+        """
+        if soft if soft is not None else settings.user_soft_delete:
+            query = update(User).where(User.id == user_id, NOT_DELETED).values(deleted_at=func.now()).returning(User.id)
+            result = await session.execute(query.execution_options(synchronize_session=False))
+            if result.scalar() is None:
+                logger.info(f"User with ID {user_id} not found.")
+                return False
+            await cls._adjust_user_count(session, -1)
+            await session.commit()
+            return True
+
         user = await cls.get_by_id(session, user_id)
         if not user:
             logger.info(f"User with ID {user_id} not found.")
             return False
         await session.delete(user)
+        await cls._adjust_user_count(session, -1)
         await session.commit()
         return True
 
     @classmethod
-    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
-        result = await cls._execute_query(session, query)
+    async def purge_deleted(cls, session: AsyncSession, deleted_before: datetime, limit: int) -> int:
+        """
+        Hard-delete up to `limit` users soft-deleted before `deleted_before`, oldest first.
+
+        Rows locked by a concurrent purger are skipped, so several workers can purge at once.
+
+        :return: The number of users removed.
+        """
+        batch = (
+            select(User.id)
+            .where(User.deleted_at < deleted_before)
+            .order_by(User.deleted_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = delete(User).where(User.id.in_(batch.scalar_subquery())).execution_options(synchronize_session=False)
+        result = await session.execute(query)
+        await session.commit()
+        return result.rowcount
+
+    @classmethod
+    async def list_users(
+        cls,
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        columns: Optional[Sequence] = None,
+        filters: Optional[UserFilter] = None,
+        sort: str = "created_at",
+    ) -> List[User]:
+        """
+        List users matching `filters`, ordered by `sort`: a key of SORT_KEYS, prefixed
+        with '-' for descending order. Ties are broken by id so pages are stable.
+        """
+        descending = sort.startswith("-")
+        key = SORT_KEYS[sort.lstrip("-")]
+        order = (key.desc(), User.id.desc()) if descending else (key, User.id)
+        query = select(User).where(NOT_DELETED, *filter_criteria(filters)).order_by(*order).offset(skip).limit(limit)
+        if columns:
+            query = query.options(load_only(*columns))
+        result = await cls._execute_read(session, query)
         return result.scalars().all() if result else []
 
+    @classmethod
+    async def list_users_keyset(
+        cls,
+        session: AsyncSession,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        before: Optional[Tuple[datetime, UUID]] = None,
+        columns: Optional[Sequence] = None,
+        filters: Optional[UserFilter] = None,
+    ) -> Tuple[List[User], bool]:
+        """
+        List users matching `filters`, ordered by (created_at, id) using keyset pagination.
+
+        :param after: (created_at, id) key of the last row of the previous page.
+        :param before: (created_at, id) key of the first row of the following page.
+        :param columns: Columns to load; the (created_at, id) key is always loaded.
+        :return: The page of users in ascending order, and whether more rows exist in the
+            direction of travel.
+        """
+        key = tuple_(User.created_at, User.id)
+        query = select(User).where(NOT_DELETED, *filter_criteria(filters))
+        if before is not None:
+            query = query.where(key < tuple_(*before)).order_by(User.created_at.desc(), User.id.desc())
+        else:
+            if after is not None:
+                query = query.where(key > tuple_(*after))
+            query = query.order_by(User.created_at, User.id)
+        if columns:
+            query = query.options(load_only(User.created_at, *columns))
+        # Fetch one extra row to learn whether another page exists without a second query.
+        result = await cls._execute_read(session, query.limit(limit + 1))
+        users = list(result.scalars().all()) if result else []
+        has_more = len(users) > limit
+        users = users[:limit]
+        if before is not None:
+            users.reverse()
+        return users, has_more
+
+    @classmethod
+    async def search_users(
+        cls,
+        session: AsyncSession,
+        term: str,
+        limit: int = 20,
+        after: Optional[Tuple[float, UUID]] = None,
+        columns: Optional[Sequence] = None,
+    ) -> Tuple[List[Tuple[User, float]], bool]:
+        """
+        Search users by nickname, email, first or last name, ranked by relevance.
+
+        A field matches when it starts with `term` or contains a word similar to it
+        (pg_trgm `<%`); both predicates are served by the trigram GIN indexes. Prefix
+        matches score 1.0, fuzzy ones their word similarity, and a user's score is the
+        best over all fields.
+
+        :param after: (score, id) key of the last result of the previous page.
+        :return: The page of (user, score) pairs, best first, and whether more exist.
+        """
+        term = term.lower()
+        matches, scores = [], []
+        for name in SEARCH_FIELDS:
+            value = func.lower(getattr(User, name))
+            is_prefix = value.startswith(term, autoescape=True)
+            matches.append(or_(is_prefix, literal(term).op("<%")(value)))
+            scores.append(case((is_prefix, 1.0), else_=func.word_similarity(term, value)))
+        score = cast(func.greatest(*scores), Float)
+        ranked = score.label("score")
+
+        query = select(User, ranked).where(NOT_DELETED, or_(*matches))
+        if after is not None:
+            after_score, after_id = after
+            query = query.where(or_(score < after_score, and_(score == after_score, User.id > after_id)))
+        if columns:
+            query = query.options(load_only(*columns))
+        query = query.order_by(ranked.desc(), User.id).limit(limit + 1)
+        result = await cls._execute_read(session, query)
+        rows = [(user, user_score) for user, user_score in result.all()] if result else []
+        return rows[:limit], len(rows) > limit
+
+    @classmethod
+    async def stream_users(
+        cls,
+        session: AsyncSession,
+        columns: Sequence = EXPORT_COLUMNS,
+        role: Optional[UserRole] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream users ordered by (created_at, id) from a server-side cursor.
+
+        Yields batches of row mappings holding only `columns`, so memory stays bounded
+        by `batch_size` however many users match.
+        """
+        query = select(*columns).where(NOT_DELETED).order_by(User.created_at, User.id)
+        if role is not None:
+            query = query.where(User.role == role)
+        if created_after is not None:
+            query = query.where(User.created_at >= created_after)
+        if created_before is not None:
+            query = query.where(User.created_at < created_before)
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.mappings().partitions(batch_size):
+            yield partition
+
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
         return await cls.create(session, user_data, get_email_service)
     
 
+    @classmethod
+    async def authenticate(cls, session: AsyncSession, email: str, password: str) -> Tuple[Optional[User], LoginOutcome]:
+        """
+        Check a login attempt with a single read of the auth columns, then record the
+        outcome with one UPDATE: a reset on success or a counted failure otherwise. A
+        successful login whose hash uses an outdated scheme or cost also stores a fresh
+        hash in that same UPDATE.
+
+        :return: The logged-in user (None unless the outcome is SUCCESS) and the outcome.
+        """
+        user = await cls.get_by_email(session, email, columns=AUTH_COLUMNS)
+        if user is None:
+            return None, LoginOutcome.INVALID
+        if user.is_locked:
+            return None, LoginOutcome.LOCKED
+        if user.email_verified is False:
+            return None, LoginOutcome.UNVERIFIED
+        if not await verify_password_async(password, user.hashed_password):
+            await cls._record_failed_login(session, user.id)
+            return None, LoginOutcome.INVALID
+        values = {"failed_login_attempts": 0, "last_login_at": func.now()}
+        if password_needs_rehash(user.hashed_password):
+            # Best effort: a saturated hashing pool must not fail a correct login; the
+            # upgrade is simply retried on the next one.
+            try:
+                values["hashed_password"] = await hash_password_async(password)
+            except HashingOverloadedError as e:
+                logger.warning(f"Skipped password rehash for user {user.id}: {e}")
+        # Skipped if a concurrent failure locked the account after it was read.
+        logged_in_user = await cls._update_returning(session, user.id, values, User.is_locked.isnot(True))
+        if logged_in_user is None:
+            return None, LoginOutcome.LOCKED
+        return logged_in_user, LoginOutcome.SUCCESS
+
     @classmethod
     async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
-        user = await cls.get_by_email(session, email)
-        if user:
-            if user.email_verified is False:
-                return None
-            if user.is_locked:
-                return None
-            if verify_password(password, user.hashed_password):
-                user.failed_login_attempts = 0
-                user.last_login_at = datetime.now(timezone.utc)
-                session.add(user)
-                await session.commit()
-                return user
-            else:
-                user.failed_login_attempts += 1
-                if user.failed_login_attempts >= settings.max_login_attempts:
-                    user.is_locked = True
-                session.add(user)
-                await session.commit()
-        return None
+        user, _ = await cls.authenticate(session, email, password)
+        return user
 
     @classmethod
-    async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
-        user = await cls.get_by_email(session, email)
-        return user.is_locked if user else False
+    async def _record_failed_login(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
+        """
+        Count a failed login and lock the account once it reaches `max_login_attempts`,
+        in one atomic UPDATE so concurrent attempts cannot lose increments.
+        """
+        attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+        return await cls._update_returning(session, user_id, {
+            "failed_login_attempts": attempts,
+            "is_locked": or_(User.is_locked.is_(True), attempts >= settings.max_login_attempts),
+        })
 
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
-        hashed_password = hash_password(new_password)
+        hashed_password = await hash_password_async(new_password)
         user = await cls.get_by_id(session, user_id)
         if user:
             user.hashed_password = hashed_password
@@ -192,17 +701,75 @@ class UserService:
         return False
 
     @classmethod
-    async def count(cls, session: AsyncSession) -> int:
+    async def count(cls, session: AsyncSession, filters: Optional[UserFilter] = None) -> int:
         """
         Count the number of users in the database.
 
         :param session: The AsyncSession instance for database access.
+        :param filters: Only count users matching these filters.
         :return: The count of users.
         """
-        query = select(func.count()).select_from(User)
+        query = select(func.count()).select_from(User).where(NOT_DELETED, *filter_criteria(filters))
         result = await session.execute(query)
         count = result.scalar()
         return count
+
+    @classmethod
+    async def count_users(cls, session: AsyncSession, strategy: str = "exact", filters: Optional[UserFilter] = None) -> Tuple[int, str]:
+        """
+        Count users with the requested strategy.
+
+        - exact: `count(*)` over the table.
+        - estimated: the planner's row estimate from `pg_class.reltuples`, which is
+          refreshed by ANALYZE/autovacuum, less the estimate for the soft-deleted rows
+          indexed by `ix_users_deleted_at` that are waiting to be purged.
+        - counter: the maintained value in `row_counters`, only kept up to date while
+          `user_count_strategy` is "counter".
+
+        Falls back to an exact count when the estimate is not yet meaningful or the
+        counter is not maintained or has not been seeded. Filtered counts are always exact, since neither
+        the estimate nor the counter can answer them.
+
+        :return: The count and the strategy actually used.
+        """
+        if filter_criteria(filters):
+            return await cls.count(session, filters), "exact"
+        if strategy == "estimated":
+            # An index that has not been analyzed yet reports -1 rows.
+            result = await session.execute(text(
+                "SELECT (users.reltuples - greatest(deleted.reltuples, 0))::bigint"
+                " FROM pg_class users, pg_class deleted"
+                " WHERE users.oid = 'users'::regclass AND deleted.oid = 'ix_users_deleted_at'::regclass"
+            ))
+            estimate = result.scalar()
+            if estimate is not None and estimate >= cls.ESTIMATE_MIN_ROWS:
+                return estimate, "estimated"
+        elif strategy == "counter" and cls.maintains_user_count():
+            result = await session.execute(select(RowCounter.value).where(RowCounter.name == User.__tablename__))
+            value = result.scalar()
+            if value is not None:
+                return value, "counter"
+        return await cls.count(session), "exact"
+
+    @staticmethod
+    def maintains_user_count() -> bool:
+        """
+        Whether writes keep the `row_counters` users count up to date. Only the counter
+        strategy reads it, so other deployments skip the extra statement and the lock on
+        that single hot row. Reseed the row from `count(*)` when switching to counter.
+        """
+        return settings.user_count_strategy == "counter"
+
+    @classmethod
+    async def _adjust_user_count(cls, session: AsyncSession, delta: int) -> None:
+        """Adjust the maintained users counter in the caller's transaction, if it is maintained."""
+        if not delta or not cls.maintains_user_count():
+            return
+        query = pg_insert(RowCounter).values(name=User.__tablename__, value=delta)
+        query = query.on_conflict_do_update(
+            index_elements=[RowCounter.name], set_={"value": RowCounter.value + delta}
+        )
+        await session.execute(query)
     
     @classmethod
     async def unlock_user_account(cls, session: AsyncSession, user_id: UUID) -> bool:
@@ -219,11 +786,10 @@ class UserService:
     @classmethod
     async def update_professional_status(cls, session: AsyncSession, user_id: UUID, is_professional: bool, email_service: EmailService) -> Optional[User]:
         try:
-            query = update(User).where(User.id == user_id).values(is_professional=is_professional).execution_options(synchronize_session="fetch")
-            await cls._execute_query(session, query)
-            updated_user = await cls.get_by_id(session, user_id)
+            updated_user = await cls._update_returning(
+                session, user_id, {"is_professional": is_professional, "professional_status_updated_at": func.now()}
+            )
             if updated_user:
-                session.refresh(updated_user)
                 logger.info(f"User {user_id} updated is_professional status successfully.")
                 try:
                     await email_service.send_professional_status_email_update(updated_user)
@@ -0,0 +1,73 @@
+from builtins import ValueError, bool, dict, float, int, isinstance, len, list, str
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Tuple
+from uuid import UUID
+
+# Direction markers stored inside a cursor.
+NEXT = "next"
+PREV = "prev"
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> Dict[str, Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(created_at: datetime, user_id: UUID, direction: str = NEXT) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+
+    The cursor carries the (created_at, id) key of the row it points from and whether
+    the page it leads to lies after or before that row.
+    """
+    return _encode({"d": direction, "k": [created_at.isoformat(), str(user_id)]})
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Tuple[datetime, UUID]]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Returns:
+        tuple: The direction and the (created_at, id) key.
+
+    Raises:
+        ValueError: If the cursor is malformed or has been tampered with.
+    """
+    try:
+        payload = _decode(cursor)
+        direction = payload["d"]
+        created_at, user_id = payload["k"]
+        if direction not in (NEXT, PREV):
+            raise ValueError(f"Unknown cursor direction: {direction}")
+        return direction, (datetime.fromisoformat(created_at), UUID(user_id))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def encode_search_cursor(score: float, user_id: UUID) -> str:
+    """Encode the (score, id) key of the last search result as a cursor for the next page."""
+    return _encode({"s": [score, str(user_id)]})
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, UUID]:
+    """
+    Decode a cursor produced by `encode_search_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed or has been tampered with.
+    """
+    try:
+        score, user_id = _decode(cursor)["s"]
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise ValueError("Search cursor score must be a number")
+        return float(score), UUID(user_id)
+    except (binascii.Error, UnicodeError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid search cursor") from e
@@ -0,0 +1,37 @@
+from builtins import dict, str
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Iterable, List, Mapping
+from uuid import UUID
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _plain(value):
+    """Convert column values to JSON/CSV friendly scalars."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def format_ndjson(rows: Iterable[Mapping]) -> str:
+    """Serialize rows as newline-delimited JSON, one object per line."""
+    return "".join(json.dumps({key: _plain(value) for key, value in row.items()}) + "\n" for row in rows)
+
+
+def format_csv(rows: Iterable[Mapping], columns: List[str], header: bool = False) -> str:
+    """Serialize rows as CSV in `columns` order, optionally preceded by a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow(["" if row[column] is None else _plain(row[column]) for column in columns])
+    return buffer.getvalue()
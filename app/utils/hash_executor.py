@@ -0,0 +1,94 @@
+from builtins import Exception, bool, dict, float, int, len, max, range, str
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from app.utils.metrics import LatencyHistogram
+
+
+class HashingOverloadedError(Exception):
+    """Raised when password hashing is saturated and the request should be retried later."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _timed_call(func: Callable, *args) -> Tuple[float, Any]:
+    # Module level so it can be pickled for process pools; time.monotonic is system-wide.
+    return time.monotonic(), func(*args)
+
+
+class BoundedHashExecutor:
+    """
+    Admission control in front of the pool that runs password hashing.
+
+    At most `max_pending` hashes may be queued or running at once; past that, calls
+    fail immediately with HashingOverloadedError instead of growing the queue. A call
+    whose hash has not started within `deadline` seconds is withdrawn from the queue and
+    fails the same way, so requests never wait behind a backlog they cannot outlive.
+    """
+
+    def __init__(self, executor: Executor, workers: int, max_pending: int, deadline: Optional[float], retry_after: int = 1):
+        self._executor = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.deadline = deadline
+        self.retry_after = retry_after
+        self._pending = 0
+        self.rejected = 0
+        self.expired = 0
+        self.queue_wait = LatencyHistogram()
+
+    async def run(self, func: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingOverloadedError("Password hashing queue is full", self.retry_after)
+        return await self._run(func, args, self.deadline)
+
+    async def run_batch(self, func: Callable, calls: Sequence[Tuple]) -> List[Any]:
+        """
+        Run `func` once per argument tuple, at most `workers` at a time.
+
+        Bulk work paces itself instead of going through admission control: it never
+        holds more than `workers` queue slots, so it neither trips the pending limit nor
+        outlives the queue deadline, and the rest of the queue stays free for logins.
+        """
+        results: List[Any] = []
+        for start in range(0, len(calls), self.workers):
+            window = calls[start:start + self.workers]
+            results.extend(await asyncio.gather(*(self._run(func, args, None) for args in window)))
+        return results
+
+    async def _run(self, func: Callable, args: Tuple, deadline: Optional[float]) -> Any:
+        self._pending += 1
+        submitted_at = time.monotonic()
+        try:
+            future = self._executor.submit(_timed_call, func, *args)
+            waiter = asyncio.wrap_future(future)
+            if deadline is not None:
+                await asyncio.wait({waiter}, timeout=deadline)
+                # cancel() only succeeds while the call is still queued; a running hash is awaited.
+                if not waiter.done() and future.cancel():
+                    self.expired += 1
+                    self.queue_wait.observe(time.monotonic() - submitted_at)
+                    raise HashingOverloadedError("Password hashing deadline exceeded", self.retry_after)
+            started_at, result = await waiter
+            self.queue_wait.observe(max(started_at - submitted_at, 0.0))
+            return result
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "queued": max(self._pending - self.workers, 0),
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+        }
@@ -0,0 +1,110 @@
+"""
+Password hashing schemes.
+
+Each hasher knows how to create hashes in its scheme, recognize them and tell when one
+was made with outdated parameters. `PasswordHashers` combines the configured default
+with every available scheme, so hashes made under an older configuration still verify
+and can be upgraded on the next successful login.
+"""
+
+from builtins import NotImplementedError, ValueError, bool, int, isinstance, str
+from typing import List
+import argon2
+import bcrypt
+
+
+class PasswordHasher:
+    """Base class for a password hashing scheme."""
+    scheme: str = ""
+
+    def hash(self, password: str) -> str:
+        raise NotImplementedError
+
+    def verify(self, password: str, hashed: str) -> bool:
+        raise NotImplementedError
+
+    def identifies(self, hashed: str) -> bool:
+        """Whether `hashed` was produced by this scheme."""
+        raise NotImplementedError
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether `hashed`, produced by this scheme, uses parameters other than the configured ones."""
+        raise NotImplementedError
+
+
+class BcryptHasher(PasswordHasher):
+    scheme = "bcrypt"
+    PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def identifies(self, hashed: str) -> bool:
+        return hashed.startswith(self.PREFIXES)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        # Hashes look like $2b$12$<salt+digest>; the cost is the second field.
+        return hashed.split("$")[2] != f"{self.rounds:02d}"
+
+
+class Argon2idHasher(PasswordHasher):
+    scheme = "argon2id"
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        self.time_cost = time_cost
+        self.memory_cost = memory_cost
+        self.parallelism = parallelism
+
+    def _hasher(self):
+        # Built per call so the hasher stays picklable for process pools.
+        return argon2.PasswordHasher(
+            time_cost=self.time_cost, memory_cost=self.memory_cost, parallelism=self.parallelism,
+            type=argon2.Type.ID,
+        )
+
+    def hash(self, password: str) -> str:
+        return self._hasher().hash(password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        try:
+            return self._hasher().verify(hashed, password)
+        except argon2.exceptions.VerifyMismatchError:
+            return False
+
+    def identifies(self, hashed: str) -> bool:
+        return hashed.startswith("$argon2id$")
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return self._hasher().check_needs_rehash(hashed)
+
+
+class PasswordHashers:
+    """The default hasher for new hashes plus every scheme that existing hashes may use."""
+
+    def __init__(self, default: PasswordHasher):
+        self.default = default
+        self.hashers: List[PasswordHasher] = [default]
+        if not isinstance(default, BcryptHasher):
+            self.hashers.append(BcryptHasher())
+        if not isinstance(default, Argon2idHasher):
+            self.hashers.append(Argon2idHasher())
+
+    def identify(self, hashed: str) -> PasswordHasher:
+        for hasher in self.hashers:
+            if hasher.identifies(hashed):
+                return hasher
+        raise ValueError("Unrecognized password hash format")
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self.identify(hashed).verify(password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether `hashed` should be replaced by a hash from the default scheme and parameters."""
+        return not self.default.identifies(hashed) or self.default.needs_rehash(hashed)
@@ -1,5 +1,5 @@
 from builtins import dict, int, max, str
-from typing import List, Callable
+from typing import List, Callable, Optional
 from urllib.parse import urlencode
 from uuid import UUID
 
@@ -12,8 +12,8 @@ def create_link(rel: str, href: str, method: str = "GET", action: str = None) ->
     return Link(rel=rel, href=href, method=method, action=action)
 
 def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationLink:
-    # Ensure parameters are added in a specific order
-    query_string = f"skip={params['skip']}&limit={params['limit']}"
+    # Parameters are encoded in the order given, e.g. skip before limit
+    query_string = urlencode(params)
     return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
 
 def create_user_links(user_id: UUID, request: Request) -> List[Link]:
@@ -30,19 +30,62 @@ def create_user_links(user_id: UUID, request: Request) -> List[Link]:
         for rel, action, method, action_desc in actions
     ]
 
-def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
-    base_url = str(request.url)
+def generate_pagination_links(
+    request: Request,
+    skip: int,
+    limit: int,
+    total_items: int,
+    *,
+    cursor: Optional[str] = None,
+    next_cursor: Optional[str] = None,
+    prev_cursor: Optional[str] = None,
+    cursor_mode: bool = False,
+    query_params: Optional[dict] = None,
+) -> List[PaginationLink]:
+    """
+    Generate self/first/last/next/prev links for an offset page or, with `cursor_mode`,
+    self/first/next/prev links that carry opaque keyset cursors. `query_params`, such
+    as filters and sort order, are carried over to every link.
+    """
+    base_url = str(request.url).split("?", 1)[0]
+    extra = query_params or {}
+    if cursor_mode:
+        return _generate_cursor_links(base_url, limit, cursor, next_cursor, prev_cursor, extra)
     total_pages = (total_items + limit - 1) // limit
     links = [
-        create_pagination_link("self", base_url, {'skip': skip, 'limit': limit}),
-        create_pagination_link("first", base_url, {'skip': 0, 'limit': limit}),
-        create_pagination_link("last", base_url, {'skip': max(0, (total_pages - 1) * limit), 'limit': limit})
+        create_pagination_link("self", base_url, {'skip': skip, 'limit': limit, **extra}),
+        create_pagination_link("first", base_url, {'skip': 0, 'limit': limit, **extra}),
+        create_pagination_link("last", base_url, {'skip': max(0, (total_pages - 1) * limit), 'limit': limit, **extra})
     ]
 
     if skip + limit < total_items:
-        links.append(create_pagination_link("next", base_url, {'skip': skip + limit, 'limit': limit}))
+        links.append(create_pagination_link("next", base_url, {'skip': skip + limit, 'limit': limit, **extra}))
 
     if skip > 0:
-        links.append(create_pagination_link("prev", base_url, {'skip': max(skip - limit, 0), 'limit': limit}))
+        links.append(create_pagination_link("prev", base_url, {'skip': max(skip - limit, 0), 'limit': limit, **extra}))
+
+    return links
+
+def _generate_cursor_links(base_url: str, limit: int, cursor: Optional[str], next_cursor: Optional[str], prev_cursor: Optional[str], extra: dict) -> List[PaginationLink]:
+    first_params = {'pagination': 'cursor', 'limit': limit, **extra}
+    links = [
+        create_pagination_link("self", base_url, {'cursor': cursor, 'limit': limit, **extra} if cursor else first_params),
+        create_pagination_link("first", base_url, first_params),
+    ]
+    if next_cursor:
+        links.append(create_pagination_link("next", base_url, {'cursor': next_cursor, 'limit': limit, **extra}))
+    if prev_cursor:
+        links.append(create_pagination_link("prev", base_url, {'cursor': prev_cursor, 'limit': limit, **extra}))
+    return links
 
+def generate_search_links(request: Request, q: str, limit: int, cursor: Optional[str], next_cursor: Optional[str]) -> List[PaginationLink]:
+    """Generate self/first/next links for a page of search results."""
+    base_url = str(request.url).split("?", 1)[0]
+    first_params = {'q': q, 'limit': limit}
+    links = [
+        create_pagination_link("self", base_url, {**first_params, 'cursor': cursor} if cursor else first_params),
+        create_pagination_link("first", base_url, first_params),
+    ]
+    if next_cursor:
+        links.append(create_pagination_link("next", base_url, {**first_params, 'cursor': next_cursor}))
     return links
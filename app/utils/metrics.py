@@ -0,0 +1,87 @@
+from builtins import dict, float, int, len, str
+import bisect
+import threading
+from typing import Dict, Sequence
+
+# Upper bounds (in seconds) used when a histogram is created without explicit buckets.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """
+    Thread-safe cumulative latency histogram.
+
+    Observations are recorded in seconds and bucketed by upper bound, in the same
+    shape Prometheus uses, so a snapshot can be scraped or logged as is.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record a single observation."""
+        index = bisect.bisect_left(self._bounds, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self._bounds) + 1)
+            self._sum = 0.0
+            self._count = 0
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return cumulative bucket counts along with the total count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        buckets: Dict[str, int] = {}
+        running = 0
+        for bound, bucket_count in zip(self._bounds, counts):
+            running += bucket_count
+            buckets[str(bound)] = running
+        buckets["+Inf"] = running + counts[-1]
+        return {"buckets": buckets, "count": count, "sum": total}
+
+
+class CollisionCounter:
+    """
+    Thread-safe counter of allocation attempts that collided with an existing value,
+    used to watch how often generated identifiers (such as nicknames) need a retry.
+    """
+
+    def __init__(self):
+        self._allocations = 0
+        self._candidates = 0
+        self._collisions = 0
+        self._rounds = 0
+        self._lock = threading.Lock()
+
+    def record(self, allocations: int, candidates: int, collisions: int, rounds: int) -> None:
+        """Record one allocation call: values handed out, candidates checked, how many were taken and query rounds used."""
+        with self._lock:
+            self._allocations += allocations
+            self._candidates += candidates
+            self._collisions += collisions
+            self._rounds += rounds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._allocations = self._candidates = self._collisions = self._rounds = 0
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            allocations, candidates, collisions, rounds = self._allocations, self._candidates, self._collisions, self._rounds
+        return {
+            "allocations": allocations,
+            "candidates": candidates,
+            "collisions": collisions,
+            "collision_rate": collisions / candidates if candidates else 0.0,
+            "rounds": rounds,
+        }
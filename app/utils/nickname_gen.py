@@ -1,10 +1,39 @@
-from builtins import str
+from builtins import int, range, str
 import random
+from typing import List
+
+ADJECTIVES = (
+    "agile", "amber", "ancient", "bold", "brave", "breezy", "bright", "calm", "candid", "cheerful",
+    "clever", "cosmic", "crisp", "curious", "daring", "dapper", "eager", "electric", "fearless", "fierce",
+    "gentle", "gleaming", "golden", "graceful", "happy", "hidden", "humble", "jolly", "keen", "lively",
+    "lucky", "mellow", "mighty", "misty", "nimble", "noble", "patient", "plucky", "polite", "quick",
+    "quiet", "rapid", "rustic", "serene", "shiny", "silent", "sly", "snowy", "stellar", "sunny",
+    "swift", "tidy", "vivid", "wandering", "wise", "witty", "zany", "zealous", "velvet", "radiant",
+    "lunar", "solar", "frosty", "dusty",
+)
+ANIMALS = (
+    "badger", "bear", "beaver", "bison", "bobcat", "buffalo", "camel", "cheetah", "cobra", "condor",
+    "coyote", "crane", "deer", "dolphin", "eagle", "falcon", "ferret", "finch", "fox", "gazelle",
+    "gecko", "heron", "hippo", "ibis", "jaguar", "kestrel", "koala", "lemur", "leopard", "lion",
+    "lynx", "marmot", "meerkat", "mink", "moose", "narwhal", "ocelot", "otter", "owl", "panda",
+    "panther", "parrot", "pelican", "penguin", "puffin", "puma", "quokka", "raccoon", "raven", "seal",
+    "shark", "sloth", "sparrow", "stork", "swan", "tapir", "tiger", "toucan", "turtle", "walrus",
+    "weasel", "whale", "wolf", "yak",
+)
+# Numeric suffix range; with the word lists above this gives ~41B combinations, so even
+# at 10M users fewer than 0.03% of generated candidates collide.
+SUFFIX_LIMIT = 10_000_000
 
 
 def generate_nickname() -> str:
     """Generate a URL-safe nickname using adjectives and animal names."""
-    adjectives = ["clever", "jolly", "brave", "sly", "gentle"]
-    animals = ["panda", "fox", "raccoon", "koala", "lion"]
-    number = random.randint(0, 999)
-    return f"{random.choice(adjectives)}_{random.choice(animals)}_{number}"
+    number = random.randrange(SUFFIX_LIMIT)
+    return f"{random.choice(ADJECTIVES)}_{random.choice(ANIMALS)}_{number}"
+
+
+def generate_nicknames(count: int) -> List[str]:
+    """Generate `count` distinct nicknames, to be checked for availability in a single query."""
+    nicknames = set()
+    while len(nicknames) < count:
+        nicknames.add(generate_nickname())
+    return list(nicknames)
@@ -0,0 +1,193 @@
+"""
+Attempt budgets for unauthenticated endpoints such as login and registration.
+
+A backend records attempts under a key (a client IP or an account identifier) and
+answers whether another one fits within `limit` attempts per `window` seconds. The
+in-memory backend keeps an exact sliding window per key and is local to the worker
+process. `SharedRateLimitBackend` approximates a sliding window with two fixed-window
+counters kept in a `CounterStore`, so every worker can share one budget through a
+store such as Redis; `LocalCounterStore` stands in for that store in tests and
+single-process deployments.
+"""
+
+from builtins import NotImplementedError, ValueError, any, bool, dict, float, int, len, max, reversed, str, tuple
+import ipaddress
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class RateLimitBackend:
+    """Base class for attempt-counting backends."""
+
+    async def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        """
+        Record an attempt under `key` if fewer than `limit` were recorded in the last
+        `window` seconds.
+
+        :return: None if the attempt was allowed, otherwise the seconds until one would be.
+        """
+        raise NotImplementedError
+
+    async def reset(self) -> None:
+        """Forget every recorded attempt."""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Exact sliding window per key, held in this process.
+
+    Rejected attempts are not recorded, so each key keeps at most `limit` timestamps.
+    Once more than `max_keys` keys are tracked, keys with no attempt inside their
+    window are dropped.
+    """
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._hits: Dict[str, Tuple[float, Deque[float]]] = {}
+
+    async def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        now = self._clock()
+        _, hits = self._hits.setdefault(key, (window, deque()))
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            return hits[0] + window - now
+        hits.append(now)
+        if len(self._hits) > self.max_keys:
+            self._prune(now)
+        return None
+
+    def _prune(self, now: float) -> None:
+        self._hits = {
+            key: (window, hits) for key, (window, hits) in self._hits.items() if hits and hits[-1] > now - window
+        }
+
+    async def reset(self) -> None:
+        self._hits.clear()
+
+
+class CounterStore:
+    """
+    Counters shared by every worker, e.g. Redis `INCR` plus `EXPIRE`.
+
+    Implementations only need atomic increments with expiry; a missing key reads as 0.
+    """
+
+    async def incr(self, key: str, ttl: float) -> int:
+        """Increment `key`, setting it to expire `ttl` seconds after it was created."""
+        raise NotImplementedError
+
+    async def get(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LocalCounterStore(CounterStore):
+    """In-process `CounterStore` for tests and single-process deployments."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._counters: Dict[str, Tuple[int, float]] = {}
+
+    def _live(self, key: str) -> Optional[Tuple[int, float]]:
+        entry = self._counters.get(key)
+        if entry is not None and entry[1] <= self._clock():
+            del self._counters[key]
+            return None
+        return entry
+
+    async def incr(self, key: str, ttl: float) -> int:
+        count, expires_at = self._live(key) or (0, self._clock() + ttl)
+        self._counters[key] = (count + 1, expires_at)
+        return count + 1
+
+    async def get(self, key: str) -> int:
+        entry = self._live(key)
+        return entry[0] if entry else 0
+
+    async def clear(self) -> None:
+        self._counters.clear()
+
+
+class SharedRateLimitBackend(RateLimitBackend):
+    """
+    Sliding window approximated from the current and previous fixed windows, with the
+    previous window's count weighted by how much of it still overlaps the sliding one.
+
+    The read and the increment are separate store calls, so workers racing on the same
+    key can briefly overshoot the limit by the number of racing attempts.
+    """
+
+    def __init__(self, store: CounterStore, clock: Callable[[], float] = time.time):
+        self.store = store
+        self._clock = clock
+
+    async def hit(self, key: str, limit: int, window: float) -> Optional[float]:
+        now = self._clock()
+        index = int(now // window)
+        elapsed = now - index * window
+        current = await self.store.get(f"{key}:{index}")
+        previous = await self.store.get(f"{key}:{index - 1}")
+        if previous * (1 - elapsed / window) + current >= limit:
+            if current >= limit:
+                return window - elapsed
+            # Time until the previous window's weight has decayed enough to admit one more.
+            return max(window * (1 - (limit - current) / previous) - elapsed, 0.0)
+        await self.store.incr(f"{key}:{index}", ttl=2 * window)
+        return None
+
+    async def reset(self) -> None:
+        await self.store.clear()
+
+
+def parse_networks(addresses: Iterable[str]) -> Tuple[IPNetwork, ...]:
+    """Parse IP addresses and CIDR ranges, e.g. from a comma-separated setting."""
+    return tuple(ipaddress.ip_network(address.strip(), strict=False) for address in addresses if address.strip())
+
+def _is_trusted(address: str, trusted: Sequence[IPNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str], trusted: Sequence[IPNetwork]) -> str:
+    """
+    The address of the client behind any trusted proxies.
+
+    `X-Forwarded-For` is only believed when the connecting peer is a trusted proxy.
+    Entries are read right to left, since each proxy appends the address it received
+    the request from; the first one that is not itself a trusted proxy is the client.
+    Anything further left was supplied by the client and could be forged.
+    """
+    if peer is None:
+        return "unknown"
+    if not forwarded_for or not _is_trusted(peer, trusted):
+        return peer
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted):
+            return hop
+    return hops[0] if hops else peer
+
+
+# Backend used by the rate limit dependencies; in-memory unless configured at startup.
+_rate_limit_backend: Optional[RateLimitBackend] = None
+
+def configure_rate_limiting(backend: RateLimitBackend) -> None:
+    """Replace the backend used by the rate limit dependencies."""
+    global _rate_limit_backend
+    _rate_limit_backend = backend
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """Return the rate limit backend, creating an in-memory one on first use."""
+    if _rate_limit_backend is None:
+        configure_rate_limiting(InMemoryRateLimitBackend())
+    return _rate_limit_backend
@@ -1,19 +1,60 @@
 # app/security.py
 from builtins import Exception, ValueError, bool, int, str
+import os
 import secrets
-import bcrypt
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
 from logging import getLogger
+from app.utils.hash_executor import BoundedHashExecutor
+from app.utils.hashers import Argon2idHasher, BcryptHasher, PasswordHasher, PasswordHashers
+from settings.config import settings
 
 # Set up logging
 logger = getLogger(__name__)
 
-def hash_password(password: str, rounds: int = 12) -> str:
+# Pool that runs bcrypt off the event loop; created on first use unless configured at startup.
+_hash_executor: Optional[BoundedHashExecutor] = None
+# Hashers for new and existing passwords; built from settings on first use.
+_password_hashers: Optional[PasswordHashers] = None
+
+def create_hasher(
+    scheme: str,
+    bcrypt_rounds: int = 12,
+    argon2_time_cost: int = 3,
+    argon2_memory_cost: int = 65536,
+    argon2_parallelism: int = 4,
+) -> PasswordHasher:
+    """Build the hasher for `scheme` with its cost parameters."""
+    if scheme == BcryptHasher.scheme:
+        return BcryptHasher(bcrypt_rounds)
+    if scheme == Argon2idHasher.scheme:
+        return Argon2idHasher(argon2_time_cost, argon2_memory_cost, argon2_parallelism)
+    raise ValueError(f"Unknown password hash scheme: {scheme}")
+
+def configure_password_hashing(hasher: PasswordHasher) -> None:
+    """Use `hasher` for new hashes; hashes from other known schemes still verify."""
+    global _password_hashers
+    _password_hashers = PasswordHashers(hasher)
+
+def get_password_hashers() -> PasswordHashers:
+    """Return the configured hashers, built from settings on first use (also in pool worker processes)."""
+    if _password_hashers is None:
+        configure_password_hashing(create_hasher(
+            settings.password_hash_scheme,
+            bcrypt_rounds=settings.password_bcrypt_rounds,
+            argon2_time_cost=settings.password_argon2_time_cost,
+            argon2_memory_cost=settings.password_argon2_memory_cost,
+            argon2_parallelism=settings.password_argon2_parallelism,
+        ))
+    return _password_hashers
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
-    Hashes a password using bcrypt with a specified cost factor.
+    Hashes a password with the configured scheme, or with bcrypt at a specific cost factor.
     
     Args:
         password (str): The plain text password to hash.
-        rounds (int): The cost factor that determines the computational cost of hashing.
+        rounds (int): bcrypt cost factor; when given, the hash is always bcrypt.
 
     Returns:
         str: The hashed password.
@@ -22,20 +63,19 @@ def hash_password(password: str, rounds: int = 12) -> str:
         ValueError: If hashing the password fails.
     """
     try:
-        salt = bcrypt.gensalt(rounds=rounds)
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed_password.decode('utf-8')
+        hasher = BcryptHasher(rounds) if rounds is not None else get_password_hashers().default
+        return hasher.hash(password)
     except Exception as e:
         logger.error("Failed to hash password: %s", e)
         raise ValueError("Failed to hash password") from e
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verifies a plain text password against a hashed password.
+    Verifies a plain text password against a hashed password of any known scheme.
     
     Args:
         plain_password (str): The plain text password to verify.
-        hashed_password (str): The bcrypt hashed password.
+        hashed_password (str): The bcrypt or argon2id hashed password.
 
     Returns:
         bool: True if the password is correct, False otherwise.
@@ -44,10 +84,83 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         ValueError: If the hashed password format is incorrect or the function fails to verify.
     """
     try:
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return get_password_hashers().verify(plain_password, hashed_password)
     except Exception as e:
         logger.error("Error verifying password: %s", e)
         raise ValueError("Authentication process encountered an unexpected error") from e
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a verified hash should be replaced because its scheme or cost is outdated."""
+    return get_password_hashers().needs_rehash(hashed_password)
+
+def configure_hash_executor(
+    workers: int,
+    kind: str = "thread",
+    max_pending: Optional[int] = None,
+    deadline: Optional[float] = None,
+    retry_after: int = 1,
+) -> None:
+    """
+    Replace the pool used by the async hashing functions.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism; a process
+    pool isolates the work completely at the cost of pickling each call.
+
+    Args:
+        workers (int): Number of hashes that can run at once.
+        kind (str): "thread" or "process".
+        max_pending (int): Hashes allowed queued or running before new ones are rejected;
+            defaults to 16 per worker.
+        deadline (float): Seconds a hash may wait in the queue before it is abandoned.
+        retry_after (int): Seconds clients are told to wait when hashing is overloaded.
+    """
+    global _hash_executor
+    if kind not in ("thread", "process"):
+        raise ValueError(f"Unknown hash executor kind: {kind}")
+    shutdown_hash_executor()
+    if kind == "process":
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    _hash_executor = BoundedHashExecutor(executor, workers, max_pending or workers * 16, deadline, retry_after)
+
+def shutdown_hash_executor() -> None:
+    """Shut down the hashing pool, waiting for running hashes to finish."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown()
+        _hash_executor = None
+
+def get_hash_executor() -> BoundedHashExecutor:
+    """Return the hashing pool, creating a default one on first use."""
+    if _hash_executor is None:
+        configure_hash_executor(os.cpu_count() or 1)
+    return _hash_executor
+
+async def hash_password_async(password: str, rounds: Optional[int] = None) -> str:
+    """
+    `hash_password` run on the hashing pool, so the event loop keeps serving other requests.
+
+    Raises:
+        HashingOverloadedError: If the pool is saturated or the hash could not start in time.
+    """
+    return await get_hash_executor().run(hash_password, password, rounds)
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    """
+    Hash many passwords for bulk work, a pool's worth at a time, so a large batch is
+    neither rejected by nor expired in the queue that sheds interactive load.
+    """
+    return await get_hash_executor().run_batch(hash_password, [(password, None) for password in passwords])
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    `verify_password` run on the hashing pool, so the event loop keeps serving other requests.
+
+    Raises:
+        HashingOverloadedError: If the pool is saturated or the check could not start in time.
+    """
+    return await get_hash_executor().run(verify_password, plain_password, hashed_password)
+
 def generate_verification_token():
     return secrets.token_urlsafe(16)  # Generates a secure 16-byte URL-safe token
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Benchmark how password verification affects the latency of unrelated requests.
+
+Runs a small FastAPI app in-process with a login-like endpoint that verifies a bcrypt
+hash either inline (the previous behavior) or through `verify_password_async`, plus a
+trivial `/ping` endpoint. While a batch of concurrent logins is in flight, `/ping` is
+called at a fixed interval and its p50/p99 latency is reported for each mode. No
+database is needed; only the hashing path differs between the two runs.
+
+Usage:
+    python -m benchmarks.bench_hash_offload --logins 32 --rounds 12 --workers 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.utils.security import (
+    configure_hash_executor, hash_password, shutdown_hash_executor, verify_password, verify_password_async,
+)
+
+PASSWORD = "MySuperPassword$1234"
+
+def build_app(hashed: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login-inline")
+    async def login_inline():
+        return {"ok": verify_password(PASSWORD, hashed)}
+
+    @app.post("/login-offloaded")
+    async def login_offloaded():
+        return {"ok": await verify_password_async(PASSWORD, hashed)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+async def timed_ping(client: AsyncClient, issued_at: float) -> float:
+    await client.get("/ping")
+    return time.perf_counter() - issued_at
+
+async def ping_latencies(client: AsyncClient, logins: list, interval: float) -> list:
+    """
+    Issue `/ping` every `interval` seconds until all logins have finished. Latency is
+    measured from when each ping was issued, so time spent waiting for a blocked event
+    loop is included.
+    """
+    pings = []
+    while not all(task.done() for task in logins):
+        pings.append(asyncio.create_task(timed_ping(client, time.perf_counter())))
+        await asyncio.sleep(interval)
+    return await asyncio.gather(*pings)
+
+async def run(mode: str, app: FastAPI, logins: int, interval: float) -> list:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        login_tasks = [asyncio.create_task(client.post(f"/login-{mode}")) for _ in range(logins)]
+        latencies = await ping_latencies(client, login_tasks, interval)
+        await asyncio.gather(*login_tasks)
+    return latencies
+
+def report(name: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{name:>10}: /ping p50 {p50:8.2f} ms   p99 {p99:8.2f} ms   max {latencies[-1] * 1000:8.2f} ms")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="concurrent logins in flight")
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds between timed /ping requests")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=4, help="hashing pool size")
+    args = parser.parse_args()
+
+    configure_hash_executor(args.workers)
+    try:
+        app = build_app(hash_password(PASSWORD, rounds=args.rounds))
+        for mode in ("inline", "offloaded"):
+            report(mode, await run(mode, app, args.logins, args.interval))
+    finally:
+        shutdown_hash_executor()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Benchmark user lookups with and without a COMMIT after every read.
+
+Seeds the `users` table of the configured database (DATABASE_URL) and times
+`UserService.get_by_email` against the previous execute-then-commit path, which is
+reproduced inline below for comparison.
+
+Usage:
+    python -m benchmarks.bench_user_lookup --users 2000 --lookups 2000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models.user_model import User, UserRole
+from app.services.user_service import UserService
+from settings.config import settings
+
+async def seed(session_factory, count: int) -> list:
+    emails = [f"bench_{uuid.uuid4().hex[:12]}@example.com" for _ in range(count)]
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "nickname": f"bench_{uuid.uuid4().hex[:16]}",
+            "email": email,
+            "hashed_password": "x",
+            "role": UserRole.AUTHENTICATED,
+            "email_verified": True,
+        }
+        for email in emails
+    ]
+    async with session_factory() as session:
+        await session.execute(insert(User), rows)
+        await session.commit()
+    return emails
+
+async def legacy_get_by_email(session: AsyncSession, email: str):
+    """The lookup as it was before: execute, then COMMIT."""
+    result = await session.execute(select(User).filter_by(email=email))
+    await session.commit()
+    return result.scalars().first()
+
+async def time_lookups(session_factory, lookup, emails: list, count: int) -> list:
+    samples = []
+    async with session_factory() as session:
+        for _ in range(count):
+            email = random.choice(emails)
+            start = time.perf_counter()
+            await lookup(session, email)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def report(label: str, samples: list) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"{label:<24} mean={statistics.mean(samples):7.3f}ms p50={statistics.median(samples):7.3f}ms p99={p99:7.3f}ms")
+
+async def main(users: int, lookups: int) -> None:
+    engine = create_async_engine(settings.database_url)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    emails = await seed(session_factory, users)
+
+    # Warm up the pool and the server's caches before measuring.
+    await time_lookups(session_factory, UserService.get_by_email, emails, 100)
+
+    report("commit per read (before)", await time_lookups(session_factory, legacy_get_by_email, emails, lookups))
+    report("read only (after)", await time_lookups(session_factory, UserService.get_by_email, emails, lookups))
+
+    async with session_factory() as session:
+        await session.execute(delete(User).where(User.email.in_(emails)))
+        await session.commit()
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000, help="Number of users to seed")
+    parser.add_argument("--lookups", type=int, default=2000, help="Number of timed lookups per variant")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.lookups))
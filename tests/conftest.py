@@ -31,10 +31,12 @@ from faker import Faker
 from app.main import app
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
-from app.dependencies import get_db, get_settings
+from app.dependencies import get_db, get_read_db, get_settings
+from app.utils.rate_limit import get_rate_limit_backend
 from app.utils.security import hash_password
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
+from app.services.user_service import UserService
 from app.services.jwt_service import create_access_token
 
 fake = Faker()
@@ -59,6 +61,7 @@ def email_service():
 async def async_client(db_session):
     async with AsyncClient(app=app, base_url="http://testserver") as client:
         app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_read_db] = lambda: db_session
         try:
             yield client
         finally:
@@ -74,6 +77,10 @@ def initialize_database():
 # this function setup and tears down (drops tales) for each test function, so you have a clean database for each test.
 @pytest.fixture(scope="function", autouse=True)
 async def setup_database():
+    # Every test starts from an empty table, so the first user created becomes admin again.
+    UserService._admin_bootstrapped = False
+    # Login and registration budgets are per test, not shared across the whole run.
+    await get_rate_limit_backend().reset()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
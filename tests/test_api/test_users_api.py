@@ -1,11 +1,13 @@
-from builtins import str
+from builtins import int, range, str
 import pytest
 from unittest.mock import patch, AsyncMock
-from app.services.user_service import UserService
+from app.services.user_service import CreateOutcome, LoginOutcome, UserService
+from app.dependencies import get_db, get_settings
 from httpx import AsyncClient
 from app.main import app
 from app.models.user_model import User, UserRole
 from app.utils.nickname_gen import generate_nickname
+from app.utils.hash_executor import HashingOverloadedError
 from app.utils.security import hash_password
 from app.services.jwt_service import decode_token  # Import your FastAPI app
 
@@ -71,9 +73,18 @@ async def test_create_user_duplicate_email(async_client, verified_user):
         "role": UserRole.ADMIN.name
     }
     response = await async_client.post("/register/", json=user_data)
-    assert response.status_code == 400
+    assert response.status_code == 409
     assert "Email already exists" in response.json().get("detail", "")
 
+@pytest.mark.asyncio
+async def test_register_reports_nickname_exhaustion(async_client):
+    """Running out of nickname candidates is a server-side failure, not a duplicate email."""
+    user_data = {"email": "fresh@example.com", "password": "AnotherPassword123!", "role": UserRole.AUTHENTICATED.name}
+    with patch.object(UserService, "create_user", new_callable=AsyncMock, return_value=(None, CreateOutcome.NICKNAME_EXHAUSTED)):
+        response = await async_client.post("/register/", json=user_data)
+    assert response.status_code == 500
+    assert "nickname" in response.json()["detail"]
+
 @pytest.mark.asyncio
 async def test_create_user_invalid_email(async_client):
     user_data = {
@@ -107,6 +118,36 @@ async def test_login_success(async_client, verified_user):
     assert decoded_token is not None, "Failed to decode token"
     assert decoded_token["role"] == "AUTHENTICATED", "The user role should be AUTHENTICATED"
 
+@pytest.mark.asyncio
+async def test_login_email_is_case_insensitive(async_client, verified_user):
+    form_data = {
+        "username": verified_user.email.upper(),
+        "password": "MySuperPassword$1234"
+    }
+    response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 200
+    assert decode_token(response.json()["access_token"])["sub"] == verified_user.email
+
+@pytest.mark.asyncio
+async def test_login_sheds_load_when_hashing_is_overloaded(async_client, verified_user):
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    overloaded = HashingOverloadedError("Password hashing queue is full", retry_after=2)
+    with patch("app.services.user_service.verify_password_async", side_effect=overloaded):
+        response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+
+@pytest.mark.asyncio
+async def test_login_sheds_load_through_real_db_dependency(async_client, verified_user):
+    """The 503 and its Retry-After survive the production get_db dependency."""
+    app.dependency_overrides.pop(get_db)
+    form_data = {"username": verified_user.email, "password": "MySuperPassword$1234"}
+    overloaded = HashingOverloadedError("Password hashing queue is full", retry_after=2)
+    with patch("app.services.user_service.verify_password_async", side_effect=overloaded):
+        response = await async_client.post("/login/", data=urlencode(form_data), headers={"Content-Type": "application/x-www-form-urlencoded"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+
 @pytest.mark.asyncio
 async def test_login_user_not_found(async_client):
     form_data = {
@@ -378,4 +419,155 @@ async def test_update_professional_status_email_service_failure(async_client, ad
 
     assert response.status_code == 200  # Ensure update still succeeds
     assert response.json()['is_professional'] == is_professional_status
-    mock_send_email.assert_awaited_once()  # Ensure the email attempt was made
\ No newline at end of file
+    mock_send_email.assert_awaited_once()  # Ensure the email attempt was made
+@pytest.mark.asyncio
+async def test_list_users_cursor_pagination(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?pagination=cursor&limit=20", headers=headers)
+    assert response.status_code == 200
+    first_page = response.json()
+    assert first_page["page"] is None
+    assert first_page["prev_cursor"] is None
+    assert first_page["next_cursor"]
+
+    response = await async_client.get(f"/users/?cursor={first_page['next_cursor']}&limit=20", headers=headers)
+    assert response.status_code == 200
+    second_page = response.json()
+    assert second_page["prev_cursor"]
+    first_ids = {item["id"] for item in first_page["items"]}
+    assert not first_ids & {item["id"] for item in second_page["items"]}
+
+@pytest.mark.asyncio
+async def test_list_users_invalid_cursor(async_client, admin_token):
+    response = await async_client.get("/users/?cursor=garbage", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_users_reports_count_strategy(async_client, admin_token):
+    response = await async_client.get("/users/?count=exact", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert response.json()["count_strategy"] == "exact"
+
+@pytest.mark.asyncio
+async def test_list_users_filtered_and_sorted(async_client, admin_token, users_with_same_role_50_users, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?role=AUTHENTICATED&email_verified=false&sort=-email&limit=10&count=counter", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 50
+    assert body["count_strategy"] == "exact"
+    next_link = next(link["href"] for link in body["links"] if link["rel"] == "next")
+    assert "role=AUTHENTICATED" in next_link and "sort=-email" in next_link
+
+@pytest.mark.asyncio
+async def test_list_users_cursor_rejects_other_sort(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/?pagination=cursor&sort=email", headers=headers)
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_bulk_create_users(async_client, admin_token, verified_user):
+    payload = {"users": [
+        {"email": "bulk_a@example.com", "password": "Secure*1234", "role": "ANONYMOUS"},
+        {"email": verified_user.email, "password": "Secure*1234", "role": "ANONYMOUS"},
+    ]}
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    with patch("app.services.email_service.EmailService.send_verification_email", new_callable=AsyncMock) as mock_send_email:
+        response = await async_client.post("/users/bulk", json=payload, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 1 and body["failed"] == 1
+    assert [result["status"] for result in body["results"]] == ["created", "duplicate_email"]
+    assert body["results"][0]["nickname"]
+    mock_send_email.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_access_denied(async_client, user_token):
+    payload = {"users": [{"email": "bulk_b@example.com", "password": "Secure*1234", "role": "ANONYMOUS"}]}
+    response = await async_client.post("/users/bulk", json=payload, headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_search_users(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/search?q={verified_user.email}", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["items"][0]["id"] == str(verified_user.id)
+    assert body["items"][0]["score"] == 1.0
+    assert body["links"][0]["rel"] == "self"
+
+@pytest.mark.asyncio
+async def test_search_users_rejects_short_query_and_bad_cursor(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/search?q=ab", headers=headers)
+    assert response.status_code == 422
+    response = await async_client.get("/users/search?q=abc&cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_export_users_ndjson(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/export?format=ndjson&role=AUTHENTICATED", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == 50
+    assert "hashed_password" not in lines[0]
+
+@pytest.mark.asyncio
+async def test_export_users_csv(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/export?format=csv", headers=headers)
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("email,nickname")
+    assert len(lines) == 52  # header, 50 users and the admin
+
+@pytest.mark.asyncio
+async def test_export_users_access_denied(async_client, user_token):
+    response = await async_client.get("/users/export", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_bulk_update_users(async_client, admin_token, locked_user, verified_user):
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    payload = {"ids": [str(locked_user.id), str(verified_user.id), missing_id], "is_locked": False, "is_professional": True}
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    with patch("app.services.email_service.EmailService.send_professional_status_email_update", new_callable=AsyncMock) as mock_send_email:
+        response = await async_client.patch("/users/bulk", json=payload, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == 2
+    assert set(body["updated_ids"]) == {str(locked_user.id), str(verified_user.id)}
+    assert body["not_found_ids"] == [missing_id]
+    assert mock_send_email.await_count == 2
+
+@pytest.mark.asyncio
+async def test_bulk_update_users_requires_a_change(async_client, admin_token, verified_user):
+    response = await async_client.patch("/users/bulk", json={"ids": [str(verified_user.id)]}, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_login_rate_limited_per_account_before_authenticating(async_client):
+    limit = get_settings().login_rate_limit_per_account
+    form_data = {"username": "target@example.com", "password": "WrongPassword$1"}
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    with patch.object(UserService, "authenticate", new_callable=AsyncMock, return_value=(None, LoginOutcome.INVALID)) as mock_authenticate:
+        for _ in range(limit):
+            response = await async_client.post("/login/", data=urlencode(form_data), headers=headers)
+            assert response.status_code == 401
+        form_data["username"] = "Target@Example.com"
+        response = await async_client.post("/login/", data=urlencode(form_data), headers=headers)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert mock_authenticate.await_count == limit
+
+@pytest.mark.asyncio
+async def test_register_rate_limited_per_ip(async_client):
+    limit = get_settings().register_rate_limit_per_ip
+    with patch.object(UserService, "create_user", new_callable=AsyncMock, return_value=(None, CreateOutcome.EMAIL_TAKEN)) as mock_register:
+        for index in range(limit + 1):
+            response = await async_client.post("/register/", json={"email": f"new{index}@example.com", "password": "AnotherPassword123!", "role": UserRole.AUTHENTICATED.name})
+    assert response.status_code == 429
+    assert mock_register.await_count == limit
@@ -0,0 +1,31 @@
+# test_cursor.py
+from datetime import datetime, timezone
+from uuid import uuid4
+import pytest
+from app.utils.cursor import NEXT, PREV, decode_cursor, decode_search_cursor, encode_cursor, encode_search_cursor
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 4, 21, 9, 51, 44, 977108, tzinfo=timezone.utc)
+    user_id = uuid4()
+    cursor = encode_cursor(created_at, user_id, PREV)
+    assert decode_cursor(cursor) == (PREV, (created_at, user_id))
+
+def test_cursor_defaults_to_next():
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4())
+    direction, _ = decode_cursor(cursor)
+    assert direction == NEXT
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", "eyJkIjoic2lkZXdheXMiLCJrIjpbXX0"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_search_cursor_round_trip():
+    user_id = uuid4()
+    cursor = encode_search_cursor(0.4285714328289032, user_id)
+    assert decode_search_cursor(cursor) == (0.4285714328289032, user_id)
+
+@pytest.mark.parametrize("cursor", ["", "e30", encode_cursor(datetime.now(timezone.utc), uuid4())])
+def test_invalid_search_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_search_cursor(cursor)
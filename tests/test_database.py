@@ -0,0 +1,56 @@
+# test_database.py
+from builtins import RuntimeError, type
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from fastapi import HTTPException
+from app.database import Database, RoutingSession
+from app.dependencies import get_db
+from app.utils.hash_executor import HashingOverloadedError
+from app.models.user_model import User
+from settings.config import settings
+
+@pytest.fixture
+def read_replica():
+    """Temporarily configure a read replica engine (pointing at the test database)."""
+    Database._read_engine = create_async_engine(settings.database_url)
+    try:
+        yield Database._read_engine
+    finally:
+        Database._read_engine = None
+
+def test_routing_session_reads_from_replica(read_replica):
+    session = RoutingSession()
+    assert session.get_bind(clause=select(User)) is read_replica.sync_engine
+
+def test_routing_session_pins_to_primary_after_write(read_replica):
+    """Read-your-writes: once the session writes, reads also go to the primary."""
+    session = RoutingSession()
+    assert session.get_bind(clause=update(User).values(is_locked=True)) is Database._engine.sync_engine
+    assert session.get_bind(clause=select(User)) is Database._engine.sync_engine
+
+def test_routing_session_without_replica_uses_primary():
+    session = RoutingSession()
+    assert session.get_bind(clause=select(User)) is Database._engine.sync_engine
+
+def test_read_session_factory_falls_back_to_primary():
+    assert Database.get_read_session_factory() is Database.get_session_factory()
+
+@pytest.mark.parametrize("error", [
+    HashingOverloadedError("Password hashing queue is full", retry_after=2),
+    HTTPException(status_code=404, detail="User not found"),
+])
+async def test_get_db_passes_mapped_errors_through(error):
+    """Errors with their own response are re-raised unchanged, not turned into a 500."""
+    dependency = get_db()
+    await dependency.__anext__()
+    with pytest.raises(type(error)) as excinfo:
+        await dependency.athrow(error)
+    assert excinfo.value is error
+
+async def test_get_db_wraps_unexpected_errors():
+    dependency = get_db()
+    await dependency.__anext__()
+    with pytest.raises(HTTPException) as excinfo:
+        await dependency.athrow(RuntimeError("boom"))
+    assert excinfo.value.status_code == 500
@@ -0,0 +1,23 @@
+# test_export.py
+from datetime import datetime, timezone
+from uuid import uuid4
+from app.models.user_model import UserRole
+from app.utils.export import format_csv, format_ndjson
+
+ROW = {
+    "id": uuid4(),
+    "email": "john.doe@example.com",
+    "role": UserRole.ADMIN,
+    "bio": None,
+    "created_at": datetime(2024, 4, 21, 9, 51, tzinfo=timezone.utc),
+}
+
+def test_format_ndjson():
+    line = format_ndjson([ROW])
+    assert line.endswith("\n")
+    assert '"role": "ADMIN"' in line
+    assert '"created_at": "2024-04-21T09:51:00+00:00"' in line
+
+def test_format_csv_with_header():
+    output = format_csv([ROW], ["email", "role", "bio"], header=True)
+    assert output.splitlines() == ["email,role,bio", "john.doe@example.com,ADMIN,"]
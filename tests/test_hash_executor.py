@@ -0,0 +1,61 @@
+# test_hash_executor.py
+from builtins import range
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.utils.hash_executor import BoundedHashExecutor, HashingOverloadedError
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+def make_executor(**kwargs):
+    return BoundedHashExecutor(ThreadPoolExecutor(max_workers=1), workers=1, **kwargs)
+
+@pytest.mark.asyncio
+async def test_runs_call_and_records_wait():
+    executor = make_executor(max_pending=2, deadline=None)
+    assert await executor.run(pow, 2, 10) == 1024
+    stats = executor.stats()
+    assert stats["pending"] == 0
+    assert stats["queue_wait_seconds"]["count"] == 1
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full(release):
+    executor = make_executor(max_pending=1, deadline=None, retry_after=3)
+    blocked = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.01)
+    with pytest.raises(HashingOverloadedError) as excinfo:
+        await executor.run(pow, 2, 2)
+    assert excinfo.value.retry_after == 3
+    assert executor.stats()["rejected"] == 1
+    release.set()
+    await blocked
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_abandons_queued_call_after_deadline(release):
+    executor = make_executor(max_pending=4, deadline=0.05)
+    blocked = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.01)
+    with pytest.raises(HashingOverloadedError):
+        await executor.run(pow, 2, 2)
+    assert executor.stats()["expired"] == 1
+    release.set()
+    # The call that was already running is awaited past the deadline.
+    assert await blocked is True
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_batch_larger_than_queue_runs_in_windows():
+    """A batch bigger than max_pending is paced by the pool instead of rejected or expired."""
+    executor = BoundedHashExecutor(ThreadPoolExecutor(max_workers=2), workers=2, max_pending=3, deadline=0.001)
+    results = await executor.run_batch(pow, [(2, n) for n in range(10)])
+    assert results == [2 ** n for n in range(10)]
+    stats = executor.stats()
+    assert (stats["rejected"], stats["expired"], stats["pending"]) == (0, 0, 0)
+    executor.shutdown()
@@ -0,0 +1,47 @@
+# test_hashers.py
+from builtins import ValueError, iter, next, range
+import pytest
+from app.cli.calibrate_hashing import calibrate
+from app.utils.hashers import Argon2idHasher, BcryptHasher, PasswordHashers
+from app.utils.security import hash_password, password_needs_rehash
+
+def test_bcrypt_needs_rehash_when_cost_differs():
+    hasher = BcryptHasher(rounds=5)
+    assert not hasher.needs_rehash(hasher.hash("secure_password"))
+    assert hasher.needs_rehash(BcryptHasher(rounds=4).hash("secure_password"))
+
+def test_password_hashers_verify_any_known_scheme():
+    hashers = PasswordHashers(BcryptHasher(rounds=5))
+    hashed = BcryptHasher(rounds=4).hash("secure_password")
+    assert hashers.identify(hashed).scheme == "bcrypt"
+    assert hashers.verify("secure_password", hashed)
+    assert not hashers.verify("wrong_password", hashed)
+    with pytest.raises(ValueError):
+        hashers.verify("secure_password", "not_a_hash")
+
+def test_password_needs_rehash_uses_configured_cost():
+    """Hashes at the configured default cost are current; other costs are upgraded."""
+    assert not password_needs_rehash(hash_password("secure_password"))
+    assert password_needs_rehash(hash_password("secure_password", rounds=4))
+
+def test_argon2id_hash_upgrades_to_bcrypt_default():
+    hashed = Argon2idHasher(time_cost=1, memory_cost=1024, parallelism=1).hash("secure_password")
+    hashers = PasswordHashers(BcryptHasher(rounds=4))
+    assert hashers.verify("secure_password", hashed)
+    assert hashers.needs_rehash(hashed)
+
+def test_calibrate_picks_highest_cost_within_target(monkeypatch):
+    timings = iter([0.01, 0.02, 0.04, 0.08])
+    monkeypatch.setattr("app.cli.calibrate_hashing.time_verify", lambda hasher, samples: next(timings))
+    cost, measurements = calibrate(BcryptHasher, range(4, 32), target=0.05, samples=1)
+    assert cost == 6
+    assert [measured for measured, _ in measurements] == [4, 5, 6, 7]
+
+def test_argon2id_needs_rehash_when_parameters_differ():
+    hasher = Argon2idHasher(time_cost=2, memory_cost=1024, parallelism=1)
+    hashers = PasswordHashers(hasher)
+    hashed = hasher.hash("secure_password")
+    assert hashers.verify("secure_password", hashed)
+    assert not hashers.needs_rehash(hashed)
+    assert hashers.needs_rehash(Argon2idHasher(time_cost=1, memory_cost=1024, parallelism=1).hash("secure_password"))
+    assert hashers.needs_rehash(BcryptHasher(rounds=4).hash("secure_password"))
@@ -0,0 +1,80 @@
+# test_import_users.py
+from builtins import dict, iter, len, list, range
+import json
+import pytest
+from sqlalchemy import select
+from app.cli.import_users import chunked, load_checkpoint, read_records, run_import, save_checkpoint, validate_chunk
+from app.models.user_model import User
+from app.utils.security import verify_password
+
+CSV_CONTENT = """email,nickname,first_name,password,role
+legacy_one@example.com,legacy_one,Ada,Legacy*1234,AUTHENTICATED
+not-an-email,legacy_two,Bob,Legacy*1234,AUTHENTICATED
+legacy_three@example.com,,Cy,Legacy*1234,AUTHENTICATED
+"""
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(CSV_CONTENT)
+    return path
+
+def test_read_records_csv_drops_empty_cells(csv_file):
+    records = list(read_records(str(csv_file), "csv"))
+    assert len(records) == 3
+    assert "nickname" not in records[2]
+
+def test_read_records_ndjson(tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_text(json.dumps({"email": "a@example.com"}) + "\n\n" + json.dumps({"email": "b@example.com"}) + "\n")
+    assert [record["email"] for record in read_records(str(path), "ndjson")] == ["a@example.com", "b@example.com"]
+
+def test_chunked():
+    assert [len(chunk) for chunk in chunked(iter(range(7)), 3)] == [3, 3, 1]
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "import.checkpoint")
+    assert load_checkpoint(path) == 0
+    save_checkpoint(path, 42)
+    assert load_checkpoint(path) == 42
+
+def test_validate_chunk_rejects_invalid(csv_file):
+    users, rejected = validate_chunk(list(read_records(str(csv_file), "csv")))
+    assert [user.email for user in users] == ["legacy_one@example.com", "legacy_three@example.com"]
+    assert rejected == 1
+
+@pytest.mark.asyncio
+async def test_run_import_is_resumable(db_session, csv_file, tmp_path):
+    checkpoint = str(tmp_path / "users.checkpoint")
+    totals = await run_import(str(csv_file), "csv", chunk_size=2, workers=1, checkpoint_path=checkpoint)
+    assert totals == {"read": 3, "inserted": 2, "skipped": 0, "renamed": 0, "rejected": 1}
+    assert load_checkpoint(checkpoint) == 3
+
+    result = await db_session.execute(select(User).where(User.email == "legacy_one@example.com"))
+    imported = result.scalars().one()
+    assert imported.email_verified
+    assert verify_password("Legacy*1234", imported.hashed_password)
+
+    # Nothing left to do when resuming from a completed checkpoint.
+    totals = await run_import(str(csv_file), "csv", chunk_size=2, workers=1, checkpoint_path=checkpoint)
+    assert totals["read"] == 0
+
+@pytest.mark.asyncio
+async def test_run_import_replaces_taken_nicknames(db_session, verified_user, tmp_path):
+    """Taken nicknames are regenerated rather than dropping the row; duplicate emails are skipped."""
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,nickname,password,role\n"
+        f"taken_nick@example.com,{verified_user.nickname},Legacy*1234,AUTHENTICATED\n"
+        "twin_one@example.com,legacy_twin,Legacy*1234,AUTHENTICATED\n"
+        "twin_two@example.com,legacy_twin,Legacy*1234,AUTHENTICATED\n"
+        f"{verified_user.email},fresh_nick,Legacy*1234,AUTHENTICATED\n"
+    )
+    totals = await run_import(str(path), "csv", chunk_size=10, workers=1, checkpoint_path=str(tmp_path / "checkpoint"))
+    assert totals == {"read": 4, "inserted": 3, "skipped": 1, "renamed": 2, "rejected": 0}
+
+    result = await db_session.execute(select(User.email, User.nickname).where(User.email.like("%@example.com")))
+    nicknames = dict(result.all())
+    assert nicknames["taken_nick@example.com"] != verified_user.nickname
+    assert "legacy_twin" in {nicknames["twin_one@example.com"], nicknames["twin_two@example.com"]}
+    assert nicknames["twin_one@example.com"] != nicknames["twin_two@example.com"]
@@ -6,7 +6,7 @@ from uuid import uuid4
 import pytest
 from fastapi import Request
 
-from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links
+from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links, generate_search_links
 
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
 
@@ -49,3 +49,29 @@ def test_generate_pagination_links(mock_request):
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
     assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+def test_generate_cursor_pagination_links(mock_request):
+    links = generate_pagination_links(mock_request, 0, 5, 50, cursor="abc", next_cursor="def", prev_cursor="ghi", cursor_mode=True)
+    hrefs = {link.rel: normalize_url(str(link.href)) for link in links}
+    assert hrefs["self"] == normalize_url("http://testserver/users?cursor=abc&limit=5")
+    assert hrefs["first"] == normalize_url("http://testserver/users?pagination=cursor&limit=5")
+    assert hrefs["next"] == normalize_url("http://testserver/users?cursor=def&limit=5")
+    assert hrefs["prev"] == normalize_url("http://testserver/users?cursor=ghi&limit=5")
+
+def test_generate_pagination_links_drops_existing_query(mock_request):
+    mock_request.url = "http://testserver/users?skip=10&limit=5"
+    links = generate_pagination_links(mock_request, 10, 5, 50)
+    assert normalize_url(str(links[0].href)) == normalize_url("http://testserver/users?skip=10&limit=5")
+
+def test_generate_search_links_keep_query(mock_request):
+    mock_request.url = "http://testserver/users/search?q=jane&cursor=abc"
+    links = generate_search_links(mock_request, "jane doe", 10, "abc", "def")
+    hrefs = {link.rel: normalize_url(str(link.href)) for link in links}
+    assert hrefs["self"] == normalize_url("http://testserver/users/search?q=jane+doe&limit=10&cursor=abc")
+    assert hrefs["first"] == normalize_url("http://testserver/users/search?q=jane+doe&limit=10")
+    assert hrefs["next"] == normalize_url("http://testserver/users/search?q=jane+doe&limit=10&cursor=def")
+
+def test_generate_pagination_links_carry_query_params(mock_request):
+    links = generate_pagination_links(mock_request, 0, 5, 50, query_params={"role": "ADMIN", "sort": "-email"})
+    hrefs = {link.rel: normalize_url(str(link.href)) for link in links}
+    assert hrefs["next"] == normalize_url("http://testserver/users?skip=5&limit=5&role=ADMIN&sort=-email")
@@ -0,0 +1,67 @@
+# test_metrics.py
+import pytest
+from app.database import Database
+from app.utils.metrics import CollisionCounter, LatencyHistogram
+
+def test_histogram_buckets_are_cumulative():
+    """Observations land in the first bucket whose bound is not exceeded."""
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.5, 5.0):
+        histogram.observe(seconds)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.01": 1, "0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(5.555)
+
+def test_histogram_reset():
+    histogram = LatencyHistogram()
+    histogram.observe(0.2)
+    histogram.reset()
+    assert histogram.snapshot()["count"] == 0
+
+def test_pool_stats_shape():
+    """The pool stats surface reports usage and a checkout wait histogram."""
+    stats = Database.get_pool_stats()
+    assert stats["pool_size"] >= 0
+    assert stats["checked_out"] >= 0
+    assert stats["idle"] >= 0
+    assert stats["overflow"] >= 0
+    assert "+Inf" in stats["checkout_wait_seconds"]["buckets"]
+
+@pytest.mark.asyncio
+async def test_db_pool_stats_requires_admin(async_client, user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    response = await async_client.get("/metrics/db-pool", headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_db_pool_stats_as_admin(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/metrics/db-pool", headers=headers)
+    assert response.status_code == 200
+    assert "checkout_wait_seconds" in response.json()
+
+def test_collision_counter_rate():
+    counter = CollisionCounter()
+    counter.record(allocations=2, candidates=10, collisions=1, rounds=1)
+    counter.record(allocations=1, candidates=10, collisions=3, rounds=2)
+    snapshot = counter.snapshot()
+    assert snapshot["allocations"] == 3
+    assert snapshot["collision_rate"] == pytest.approx(0.2)
+    assert snapshot["rounds"] == 3
+    counter.reset()
+    assert counter.snapshot()["collision_rate"] == 0.0
+
+@pytest.mark.asyncio
+async def test_nickname_stats_as_admin(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/metrics/nicknames", headers=headers)
+    assert response.status_code == 200
+    assert "collision_rate" in response.json()
+
+@pytest.mark.asyncio
+async def test_password_hashing_stats_as_admin(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/metrics/password-hashing", headers=headers)
+    assert response.status_code == 200
+    assert {"pending", "queued", "rejected", "queue_wait_seconds"} <= response.json().keys()
@@ -0,0 +1,83 @@
+# test_rate_limit.py
+from builtins import range
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.dependencies import rate_limit
+from app.utils.rate_limit import (
+    InMemoryRateLimitBackend, LocalCounterStore, SharedRateLimitBackend, client_ip, configure_rate_limiting, parse_networks,
+)
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+async def test_in_memory_backend_slides_the_window():
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(clock=clock)
+    for _ in range(3):
+        assert await backend.hit("login:ip:1.2.3.4", limit=3, window=60) is None
+    assert await backend.hit("login:ip:1.2.3.4", limit=3, window=60) == 60
+    assert await backend.hit("login:ip:5.6.7.8", limit=3, window=60) is None
+    clock.now += 30
+    assert await backend.hit("login:ip:1.2.3.4", limit=3, window=60) == 30
+    clock.now += 30
+    assert await backend.hit("login:ip:1.2.3.4", limit=3, window=60) is None
+
+async def test_in_memory_backend_prunes_idle_keys():
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(max_keys=2, clock=clock)
+    await backend.hit("a", limit=1, window=10)
+    await backend.hit("b", limit=1, window=10)
+    clock.now += 11
+    await backend.hit("c", limit=1, window=10)
+    assert set(backend._hits) == {"c"}
+
+async def test_shared_backend_weights_previous_window():
+    clock = FakeClock(now=600.0)
+    backend = SharedRateLimitBackend(LocalCounterStore(clock=clock), clock=clock)
+    for _ in range(4):
+        assert await backend.hit("register:identity:a@example.com", limit=4, window=60) is None
+    assert await backend.hit("register:identity:a@example.com", limit=4, window=60) == 60
+    # 25s into the next window the previous one still counts for 35/60 of its 4 attempts.
+    clock.now += 85
+    assert await backend.hit("register:identity:a@example.com", limit=4, window=60) is None
+    assert await backend.hit("register:identity:a@example.com", limit=4, window=60) is None
+    assert await backend.hit("register:identity:a@example.com", limit=4, window=60) == 5
+
+async def test_shared_backend_reset_clears_store():
+    clock = FakeClock()
+    backend = SharedRateLimitBackend(LocalCounterStore(clock=clock), clock=clock)
+    await backend.hit("k", limit=1, window=60)
+    assert await backend.hit("k", limit=1, window=60) is not None
+    await backend.reset()
+    assert await backend.hit("k", limit=1, window=60) is None
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peer():
+    trusted = parse_networks(["10.0.0.0/8"])
+    assert client_ip("203.0.113.7", "198.51.100.1", trusted) == "203.0.113.7"
+    assert client_ip("10.0.0.2", None, trusted) == "10.0.0.2"
+    assert client_ip(None, "198.51.100.1", trusted) == "unknown"
+
+def test_client_ip_takes_rightmost_untrusted_hop():
+    trusted = parse_networks("10.0.0.0/8, 192.168.1.5".split(","))
+    # The leftmost entry was written by the client and is not believed.
+    assert client_ip("10.0.0.2", "1.1.1.1, 198.51.100.1, 192.168.1.5", trusted) == "198.51.100.1"
+    assert client_ip("10.0.0.2", "10.0.0.9", trusted) == "10.0.0.9"
+
+async def test_rate_limit_keys_on_forwarded_client_behind_trusted_proxy():
+    configure_rate_limiting(InMemoryRateLimitBackend())
+    app = FastAPI()
+
+    @app.post("/attempt", dependencies=[Depends(rate_limit("test", "email", 1, 0, 60, ["127.0.0.1"]))])
+    async def attempt():
+        return {}
+
+    async with AsyncClient(transport=ASGITransport(app=app, client=("127.0.0.1", 1234)), base_url="http://test") as client:
+        statuses = [
+            (await client.post("/attempt", json={}, headers={"X-Forwarded-For": forwarded_for})).status_code
+            for forwarded_for in ("198.51.100.1", "198.51.100.2", "198.51.100.1")
+        ]
+    assert statuses == [200, 200, 429]
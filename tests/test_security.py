@@ -1,7 +1,7 @@
 # test_security.py
-from builtins import RuntimeError, ValueError, isinstance, str
+from builtins import RuntimeError, ValueError, isinstance, range, str, zip
 import pytest
-from app.utils.security import hash_password, verify_password
+from app.utils.security import configure_hash_executor, hash_password, hash_password_async, hash_passwords_async, shutdown_hash_executor, verify_password, verify_password_async
 
 def test_hash_password():
     """Test that hashing password returns a bcrypt hashed string."""
@@ -65,3 +65,32 @@ def test_hash_password_internal_error(monkeypatch):
     with pytest.raises(ValueError):
         hash_password("test")
 
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    """The async variants run on the hashing pool and agree with the sync ones."""
+    hashed = await hash_password_async("secure_password", rounds=4)
+    assert hashed.startswith('$2b$04$')
+    assert await verify_password_async("secure_password", hashed) is True
+    assert verify_password("incorrect_password", hashed) is False
+
+@pytest.mark.asyncio
+async def test_configure_hash_executor():
+    configure_hash_executor(2)
+    try:
+        assert await verify_password_async("pw", hash_password("pw", rounds=4)) is True
+    finally:
+        shutdown_hash_executor()
+    with pytest.raises(ValueError):
+        configure_hash_executor(2, "fiber")
+
+@pytest.mark.asyncio
+async def test_hash_passwords_async_exceeds_queue_limit():
+    """Bulk hashing is paced a pool at a time, so batches over max_pending still succeed."""
+    configure_hash_executor(2, max_pending=2, deadline=0.001)
+    try:
+        passwords = [f"password-{index}" for index in range(5)]
+        hashed = await hash_passwords_async(passwords)
+        assert [verify_password(password, h) for password, h in zip(passwords, hashed)] == [True] * 5
+    finally:
+        shutdown_hash_executor()
@@ -0,0 +1,44 @@
+from builtins import range, str
+from datetime import timedelta
+from unittest.mock import patch
+from app.services.jwt_service import TokenClaimsCache, create_access_token, decode_token, decode_token_cached
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_claims_cache_expires_at_token_exp():
+    clock = FakeClock()
+    cache = TokenClaimsCache(max_size=10, ttl=300, clock=clock)
+    cache.put("token", {"sub": "a@example.com", "exp": 1060})
+    assert cache.get("token")["sub"] == "a@example.com"
+    clock.now = 1060
+    assert cache.get("token") is None
+
+def test_claims_cache_expires_after_ttl():
+    clock = FakeClock()
+    cache = TokenClaimsCache(max_size=10, ttl=30, clock=clock)
+    cache.put("token", {"sub": "a@example.com", "exp": 5000})
+    clock.now += 31
+    assert cache.get("token") is None
+
+def test_claims_cache_evicts_least_recently_used():
+    cache = TokenClaimsCache(max_size=2, ttl=300)
+    for index in range(2):
+        cache.put(f"token-{index}", {"sub": str(index)})
+    cache.get("token-0")
+    cache.put("token-2", {"sub": "2"})
+    assert cache.get("token-1") is None
+    assert cache.get("token-0") is not None and cache.get("token-2") is not None
+
+def test_decode_token_cached_verifies_once():
+    token = create_access_token(data={"sub": "a@example.com", "role": "authenticated"}, expires_delta=timedelta(minutes=5))
+    with patch("app.services.jwt_service.decode_token", wraps=decode_token) as mock_decode:
+        first = decode_token_cached(token)
+        second = decode_token_cached(token)
+    assert first == second and first["role"] == "AUTHENTICATED"
+    assert mock_decode.call_count == 1
+    assert decode_token_cached("not-a-token") is None
@@ -1,11 +1,18 @@
 from builtins import range
+from datetime import datetime, timedelta, timezone
 import pytest
 from unittest.mock import AsyncMock, patch
-from sqlalchemy import select
+from uuid import uuid4
+from sqlalchemy import inspect, select, text
+from sqlalchemy.dialects import postgresql
 from app.dependencies import get_settings
+from app.models.counter_model import RowCounter
 from app.models.user_model import User, UserRole
-from app.services.user_service import UserService
+from app.services.user_service import RESPONSE_COLUMNS, CreateOutcome, LoginOutcome, UserService, filter_criteria, settings
+from app.schemas.user_schemas import UserCreate, UserFilter
+from app.utils.hash_executor import HashingOverloadedError
 from app.utils.nickname_gen import generate_nickname
+from app.utils.security import configure_hash_executor, hash_password, shutdown_hash_executor, verify_password
 
 pytestmark = pytest.mark.asyncio
 
@@ -139,8 +146,9 @@ async def test_account_lock_after_failed_logins(db_session, verified_user):
     for _ in range(max_login_attempts):
         await UserService.login_user(db_session, verified_user.email, "wrongpassword")
     
-    is_locked = await UserService.is_account_locked(db_session, verified_user.email)
+    is_locked = await db_session.scalar(select(User.is_locked).where(User.id == verified_user.id))
     assert is_locked, "The account should be locked after the maximum number of failed login attempts."
+    assert await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234") == (None, LoginOutcome.LOCKED)
 
 # Test resetting a user's password
 async def test_reset_password(db_session, user):
@@ -266,6 +274,7 @@ async def test_update_professional_status_true(db_session, user, email_service):
     updated_user = await UserService.update_professional_status(db_session, user.id, True, email_service)
     assert updated_user is not None
     assert updated_user.is_professional is True
+    assert updated_user.professional_status_updated_at is not None
 
 # Test for updating professional status to 'False'
 async def test_update_professional_status_false(db_session, user, email_service):
@@ -277,3 +286,288 @@ async def test_update_professional_status_false(db_session, user, email_service)
 async def test_update_professional_status_invalid_user_id(db_session, email_service):
     updated_user = await UserService.update_professional_status(db_session, "invalid_id", True, email_service)
     assert updated_user is None
+
+# Lookups no longer commit after every read
+async def test_get_by_id_does_not_commit(db_session, user):
+    with patch.object(db_session, "commit", new_callable=AsyncMock) as mock_commit:
+        retrieved_user = await UserService.get_by_id(db_session, user.id)
+    assert retrieved_user.id == user.id
+    mock_commit.assert_not_awaited()
+
+# Test keyset pagination walks forward and back without overlap
+async def test_list_users_keyset(db_session, users_with_same_role_50_users):
+    page_1, has_more = await UserService.list_users_keyset(db_session, limit=20)
+    assert len(page_1) == 20 and has_more
+    last = page_1[-1]
+    page_2, has_more = await UserService.list_users_keyset(db_session, limit=20, after=(last.created_at, last.id))
+    assert len(page_2) == 20 and has_more
+    assert not {user.id for user in page_1} & {user.id for user in page_2}
+    page_3, has_more = await UserService.list_users_keyset(db_session, limit=20, after=(page_2[-1].created_at, page_2[-1].id))
+    assert len(page_3) == 10 and not has_more
+    back, has_more = await UserService.list_users_keyset(db_session, limit=20, before=(page_2[0].created_at, page_2[0].id))
+    assert [user.id for user in back] == [user.id for user in page_1]
+    assert not has_more
+
+# Tests for count strategies
+async def test_count_users_exact(db_session, users_with_same_role_50_users):
+    total, strategy = await UserService.count_users(db_session, "exact")
+    assert (total, strategy) == (50, "exact")
+
+async def test_count_users_estimated_falls_back_on_small_table(db_session, users_with_same_role_50_users):
+    total, strategy = await UserService.count_users(db_session, "estimated")
+    assert (total, strategy) == (50, "exact")
+
+async def test_count_users_estimated_excludes_soft_deleted(db_session, users_with_same_role_50_users, monkeypatch):
+    monkeypatch.setattr(UserService, "ESTIMATE_MIN_ROWS", 1)
+    for user in users_with_same_role_50_users[:10]:
+        await UserService.delete(db_session, user.id, soft=True)
+    await db_session.execute(text("ANALYZE users"))
+    total, strategy = await UserService.count_users(db_session, "estimated")
+    assert (total, strategy) == (40, "estimated")
+
+async def test_count_users_counter_tracks_create_and_delete(db_session, email_service, monkeypatch):
+    monkeypatch.setattr(settings, "user_count_strategy", "counter")
+    user_data = {
+        "nickname": generate_nickname(),
+        "email": "counted@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.ANONYMOUS.name
+    }
+    user = await UserService.create(db_session, user_data, email_service)
+    assert await UserService.count_users(db_session, "counter") == (1, "counter")
+    await UserService.delete(db_session, user.id)
+    assert await UserService.count_users(db_session, "counter") == (0, "counter")
+
+# Projected lookups load only the requested columns
+async def test_get_by_email_with_columns_defers_the_rest(db_session, verified_user):
+    db_session.expunge_all()
+    retrieved_user = await UserService.get_by_email(db_session, verified_user.email, columns=RESPONSE_COLUMNS)
+    assert retrieved_user.email == verified_user.email
+    assert "hashed_password" in inspect(retrieved_user).unloaded
+    assert "bio" not in inspect(retrieved_user).unloaded
+
+async def test_list_users_with_columns(db_session, users_with_same_role_50_users):
+    db_session.expunge_all()
+    users = await UserService.list_users(db_session, skip=0, limit=10, columns=RESPONSE_COLUMNS)
+    assert len(users) == 10
+    assert all("verification_token" in inspect(user).unloaded for user in users)
+
+# Bulk creation resolves conflicts per item
+async def test_create_many(db_session, verified_user):
+    users_data = [
+        UserCreate(email="bulk_one@example.com", nickname="bulk_one", password="BulkPassword123!", role=UserRole.ANONYMOUS),
+        UserCreate(email=verified_user.email, nickname="bulk_two", password="BulkPassword123!", role=UserRole.ANONYMOUS),
+        UserCreate(email="bulk_three@example.com", nickname=verified_user.nickname, password="BulkPassword123!", role=UserRole.ANONYMOUS),
+        UserCreate(email="bulk_one@example.com", nickname="bulk_four", password="BulkPassword123!", role=UserRole.ANONYMOUS),
+    ]
+    results, created_users = await UserService.create_many(db_session, users_data)
+    assert [result["status"] for result in results] == ["created", "duplicate_email", "created", "duplicate_email"]
+    assert results[0]["nickname"] == "bulk_one"
+    assert results[2]["nickname"] != verified_user.nickname
+    assert len(created_users) == 2
+    stored = await UserService.get_by_email(db_session, "bulk_three@example.com")
+    assert stored is not None and stored.verification_token is not None
+
+# A batch larger than the hashing queue is paced through the pool, not shed
+async def test_create_many_larger_than_hash_queue(db_session):
+    configure_hash_executor(2, max_pending=2, deadline=0.001)
+    try:
+        users_data = [
+            UserCreate(email=f"bulk_{index}@example.com", password="BulkPassword123!", role=UserRole.ANONYMOUS)
+            for index in range(6)
+        ]
+        results, created_users = await UserService.create_many(db_session, users_data)
+    finally:
+        shutdown_hash_executor()
+    assert [result["status"] for result in results] == ["created"] * 6
+    assert len(created_users) == 6
+
+# Bulk update applies one change to many users
+async def test_bulk_update(db_session, users_with_same_role_50_users):
+    target_ids = [user.id for user in users_with_same_role_50_users[:5]]
+    rows = await UserService.bulk_update(db_session, target_ids + [uuid4()], role=UserRole.MANAGER, is_professional=True)
+    assert {row.id for row in rows} == set(target_ids)
+    assert all(row.is_professional for row in rows)
+    db_session.expunge_all()
+    updated = await UserService.get_by_id(db_session, target_ids[0])
+    assert updated.role == UserRole.MANAGER
+    assert updated.professional_status_updated_at is not None
+
+# Soft-deleted users are hidden from lookups until purged
+async def test_soft_delete_hides_user(db_session, verified_user):
+    assert await UserService.delete(db_session, verified_user.id, soft=True) is True
+    assert await UserService.get_by_id(db_session, verified_user.id) is None
+    assert await UserService.get_by_email(db_session, verified_user.email) is None
+    assert await UserService.delete(db_session, verified_user.id, soft=True) is False
+    stored = await db_session.scalar(select(User.deleted_at).where(User.id == verified_user.id))
+    assert stored is not None
+
+# A soft-deleted user's email can be registered again before the row is purged
+async def test_soft_deleted_email_can_register_again(db_session, email_service, verified_user):
+    assert await UserService.delete(db_session, verified_user.id, soft=True) is True
+    user_data = {"email": verified_user.email.upper(), "password": "ValidPassword123!", "role": UserRole.ANONYMOUS.name}
+    user, outcome = await UserService.create_user(db_session, user_data, email_service)
+    assert outcome == CreateOutcome.CREATED
+    assert user.id != verified_user.id
+    assert (await UserService.get_by_email(db_session, verified_user.email)).id == user.id
+
+async def test_purge_deleted_removes_in_batches(db_session, users_with_same_role_50_users):
+    for user in users_with_same_role_50_users[:5]:
+        await UserService.delete(db_session, user.id, soft=True)
+    cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+    assert await UserService.purge_deleted(db_session, cutoff, limit=3) == 3
+    assert await UserService.purge_deleted(db_session, cutoff, limit=3) == 2
+    assert await UserService.purge_deleted(db_session, cutoff, limit=3) == 0
+    assert await UserService.count(db_session) == 45
+
+# Generated nicknames skip taken ones without a query per candidate
+async def test_create_user_with_taken_nickname_gets_new_one(db_session, email_service, verified_user):
+    user_data = {
+        "nickname": verified_user.nickname,
+        "email": "nickname_taken@example.com",
+        "password": "ValidPassword123!",
+        "role": UserRole.ANONYMOUS.name
+    }
+    user = await UserService.create(db_session, user_data, email_service)
+    assert user is not None
+    assert user.nickname != verified_user.nickname
+
+async def test_allocate_nicknames_skips_taken(db_session):
+    taken = set()
+    nicknames = await UserService._allocate_nicknames(db_session, 25, taken)
+    assert len(set(nicknames)) == 25
+    assert taken == set(nicknames)
+
+# A duplicate email is reported by the insert itself and leaves the session usable
+async def test_create_user_duplicate_email_then_create_again(db_session, email_service, verified_user):
+    user_data = {
+        "nickname": generate_nickname(),
+        "email": verified_user.email,
+        "password": "ValidPassword123!",
+        "role": UserRole.ANONYMOUS.name
+    }
+    assert await UserService.create(db_session, user_data, email_service) is None
+    user_data["email"] = "after_conflict@example.com"
+    user = await UserService.create(db_session, user_data, email_service)
+    assert user is not None
+    assert user.verification_token is not None
+
+# create_user tells each kind of failure apart
+async def test_create_user_outcomes(db_session, email_service, verified_user):
+    user_data = {"email": verified_user.email, "password": "ValidPassword123!", "role": UserRole.ANONYMOUS.name}
+    assert await UserService.create_user(db_session, user_data, email_service) == (None, CreateOutcome.EMAIL_TAKEN)
+    invalid_data = {"email": "not-an-email", "password": "ValidPassword123!"}
+    assert await UserService.create_user(db_session, invalid_data, email_service) == (None, CreateOutcome.INVALID)
+    taken = verified_user.nickname
+    user_data.update(email="exhausted@example.com", nickname=taken)
+    with patch("app.services.user_service.generate_nicknames", side_effect=lambda count: [taken] * count):
+        assert await UserService.create_user(db_session, user_data, email_service) == (None, CreateOutcome.NICKNAME_EXHAUSTED)
+    user, outcome = await UserService.create_user(db_session, {**user_data, "nickname": None}, email_service)
+    assert outcome == CreateOutcome.CREATED and user.email == "exhausted@example.com"
+
+# Only the first user is bootstrapped as admin, and later registrations skip the check
+async def test_bootstrap_admin_is_cached(db_session, email_service):
+    users = []
+    for i in range(2):
+        user_data = {
+            "nickname": generate_nickname(),
+            "email": f"bootstrap{i}@example.com",
+            "password": "ValidPassword123!",
+        }
+        users.append(await UserService.create(db_session, user_data, email_service))
+    assert [user.role for user in users] == [UserRole.ADMIN, UserRole.ANONYMOUS]
+    assert UserService._admin_bootstrapped is True
+
+# Email lookups ignore case
+async def test_get_by_email_ignores_case(db_session, user):
+    retrieved_user = await UserService.get_by_email(db_session, user.email.upper())
+    assert retrieved_user is not None
+    assert retrieved_user.id == user.id
+
+# Search ranks prefix matches first and pages by (score, id)
+async def test_search_users_prefix_and_fuzzy(db_session, verified_user):
+    rows, has_more = await UserService.search_users(db_session, verified_user.nickname[:4], limit=10)
+    assert verified_user.id in [user.id for user, _ in rows]
+    assert not has_more
+    rows, _ = await UserService.search_users(db_session, verified_user.email, limit=10)
+    assert rows[0][0].id == verified_user.id
+    assert rows[0][1] == 1.0
+
+async def test_search_users_keyset(db_session, users_with_same_role_50_users):
+    term = users_with_same_role_50_users[0].email.split("@")[1]
+    first_page, has_more = await UserService.search_users(db_session, term, limit=5)
+    user, score = first_page[-1]
+    second_page, _ = await UserService.search_users(db_session, term, limit=5, after=(score, user.id))
+    assert not {user.id for user, _ in first_page} & {user.id for user, _ in second_page}
+    assert all(score >= next_score for _, next_score in second_page)
+
+# Listings can be filtered and sorted by whitelisted keys
+async def test_list_users_filters_and_sort(db_session, users_with_same_role_50_users, locked_user):
+    locked = await UserService.list_users(db_session, limit=100, filters=UserFilter(is_locked=True))
+    assert [user.id for user in locked] == [locked_user.id]
+    assert await UserService.count(db_session, UserFilter(is_locked=True)) == 1
+    newest_first = await UserService.list_users(db_session, limit=100, sort="-created_at")
+    keys = [(user.created_at, user.id) for user in newest_first]
+    assert keys == sorted(keys, reverse=True)
+
+# Boolean filters are literal predicates that imply the partial index conditions
+def test_filter_criteria_emits_literal_boolean_predicates():
+    criteria = filter_criteria(UserFilter(is_locked=True, email_verified=False, is_professional=True))
+    compiled = select(User.id).where(*criteria).compile(dialect=postgresql.dialect())
+    assert "users.is_locked AND NOT users.email_verified AND users.is_professional" in str(compiled)
+    assert not compiled.params
+
+# Updates return the row written by UPDATE ... RETURNING, without a follow-up read
+async def test_update_returns_written_row(db_session, user):
+    updated_user = await UserService.update(db_session, user.id, {"first_name": "Returned"})
+    assert updated_user.first_name == "Returned"
+    assert updated_user.updated_at is not None
+    assert await UserService.update(db_session, uuid4(), {"first_name": "Nobody"}) is None
+
+# Failed logins are counted in the database and a successful login resets the count
+async def test_failed_login_count_reset_on_success(db_session, verified_user):
+    await UserService.login_user(db_session, verified_user.email, "wrongpassword")
+    counted = await db_session.scalar(select(User.failed_login_attempts).where(User.id == verified_user.id))
+    assert counted == 1
+    logged_in_user = await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    assert logged_in_user.failed_login_attempts == 0
+    assert logged_in_user.last_login_at is not None
+
+# authenticate decides every login outcome from one read of the auth columns
+async def test_authenticate_outcomes(db_session, verified_user, unverified_user, locked_user):
+    password = "MySuperPassword$1234"
+    user, outcome = await UserService.authenticate(db_session, verified_user.email, password)
+    assert (user.id, outcome) == (verified_user.id, LoginOutcome.SUCCESS)
+    assert await UserService.authenticate(db_session, verified_user.email, "wrong") == (None, LoginOutcome.INVALID)
+    assert await UserService.authenticate(db_session, unverified_user.email, password) == (None, LoginOutcome.UNVERIFIED)
+    assert await UserService.authenticate(db_session, locked_user.email, password) == (None, LoginOutcome.LOCKED)
+    assert await UserService.authenticate(db_session, "nobody@example.com", password) == (None, LoginOutcome.INVALID)
+
+# A successful login replaces a hash made with an outdated cost
+async def test_login_rehashes_outdated_password(db_session, verified_user):
+    verified_user.hashed_password = hash_password("MySuperPassword$1234", rounds=4)
+    await db_session.commit()
+    logged_in_user = await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    assert logged_in_user.hashed_password.startswith(f"$2b${get_settings().password_bcrypt_rounds:02d}$")
+    assert verify_password("MySuperPassword$1234", logged_in_user.hashed_password)
+
+# Without the counter strategy, writes leave row_counters alone and counter reads fall back to exact
+async def test_counter_not_maintained_by_default(db_session, email_service):
+    user_data = {"email": "uncounted@example.com", "password": "ValidPassword123!", "role": UserRole.ANONYMOUS.name}
+    await UserService.create(db_session, user_data, email_service)
+    assert await db_session.scalar(select(RowCounter.value).where(RowCounter.name == "users")) in (None, 0)
+    assert await UserService.count_users(db_session, "counter") == (1, "exact")
+
+# An overloaded hashing pool skips the upgrade but still logs the user in
+async def test_login_succeeds_when_rehash_is_shed(db_session, verified_user):
+    old_hash = hash_password("MySuperPassword$1234", rounds=4)
+    verified_user.hashed_password = old_hash
+    verified_user.failed_login_attempts = 2
+    await db_session.commit()
+    overloaded = HashingOverloadedError("Password hashing queue is full", retry_after=1)
+    with patch("app.services.user_service.hash_password_async", side_effect=overloaded):
+        user, outcome = await UserService.authenticate(db_session, verified_user.email, "MySuperPassword$1234")
+    assert outcome == LoginOutcome.SUCCESS
+    assert user.hashed_password == old_hash
+    assert user.failed_login_attempts == 0
+    assert user.last_login_at is not None